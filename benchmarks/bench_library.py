@@ -0,0 +1,194 @@
+"""
+End-to-end library benchmarks against a synthetic Steam install and a local API stand-in.
+
+    python -m benchmarks.bench_library [--sizes 100,1000,10000] [--latency 0.005]
+                                       [--output results.json] [--compare old.json]
+
+Every size runs in its own process with a fresh APPDATA, so the DB, caches and
+settings start empty. Results (seconds per scenario) are written as JSON, by default
+to benchmarks/results/<commit>.json; --compare prints the change against an older file.
+
+To replay recorded API traffic instead of the stand-in (see core.http_transport), record
+once and replay on the same --port, so the fixture URLs match:
+
+    AVOCADO_HTTP_TRANSPORT=record AVOCADO_HTTP_FIXTURES=fx python -m benchmarks.bench_library --sizes 100 --port 8765
+    AVOCADO_HTTP_TRANSPORT=replay AVOCADO_HTTP_FIXTURES=fx AVOCADO_HTTP_ERROR_RATE=0.05 \
+        python -m benchmarks.bench_library --sizes 100 --port 8765
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Share of the library changed between the two refresh runs
+CHANGE_RATIO = 0.01
+
+
+# ---- Child: one library size ----
+def _timed(results: dict, name: str, func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    results[name] = round(time.perf_counter() - start, 4)
+    print(f"  {name:<32} {results[name] * 1000:10.1f} ms", flush=True)
+    return value
+
+
+def run_size(size: int, latency: float, port: int = 0) -> dict:
+    """Run every scenario for one library size. APPDATA must point at an empty folder."""
+    from benchmarks.fake_api import FakeApi
+    from benchmarks.synthetic_steam import FIRST_APPID, generate_steam_root, uninstall, write_manifest
+
+    base = Path(os.environ["APPDATA"])
+    results, info = {}, {"size": size}
+
+    steam = _timed(results, "generate_steam_root", generate_steam_root, base, size)
+    # Owned but not installed games, which import and refresh have to skip
+    owned = steam["appids"] + list(range(FIRST_APPID + size, FIRST_APPID + size + size // 10))
+    api = FakeApi(owned, latency=latency, port=port).start()
+    os.environ.update(api.env())
+    os.environ["STEAM_PATH"] = str(steam["root"])
+
+    # Imported only now: endpoints and data folders are read at import time
+    from core.db import init_db, load_games, save_games
+    from core.manager import import_games_from_steam, quick_refresh
+    from core.metrics import metrics
+    from core.steam_manifest import get_installed_appids
+
+    try:
+        _timed(results, "init_db", init_db)
+        _timed(results, "get_installed_appids.cold", get_installed_appids)
+        _timed(results, "get_installed_appids.warm", get_installed_appids)
+
+        imported = _timed(results, "import_games_from_steam", import_games_from_steam, "bench")
+        info["imported"] = len(imported)
+        info["import_metrics"] = metrics.snapshot()  # Where the import's time went
+
+        _timed(results, "quick_refresh.unchanged", quick_refresh, "bench")
+
+        # Change ~1%: new playtimes, uninstalls and fresh installs
+        changes = max(1, int(size * CHANGE_RATIO))
+        for appid in steam["appids"][:changes]:
+            api.owned[appid] += 30
+        uninstall(steam, steam["appids"][-changes:])
+        for appid in range(FIRST_APPID + size, FIRST_APPID + size + changes):
+            write_manifest(steam["root"] / "steamapps", appid)
+        diff = _timed(results, "quick_refresh.changed", quick_refresh, "bench")
+        info["refresh_diff"] = {key: len(value) for key, value in diff.items()}
+
+        games = _timed(results, "load_games", load_games)
+        _timed(results, "save_games", save_games, games)
+
+        results.update(_bench_populate(games))
+        info["requests"] = dict(api.requests)
+    finally:
+        api.stop()
+
+    return {"info": info, "results": results}
+
+
+def _bench_populate(games: list[dict]) -> dict:
+    """GamesModel.set_games, which is what MainWindow.populate_games runs."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        print("  populate_games skipped (PyQt6 not installed)")
+        return {}
+    from ui.games_model import GamesModel
+
+    app = QApplication.instance() or QApplication([])
+    model = GamesModel()
+    results = {}
+    _timed(results, "populate_games.initial", model.set_games, games)
+
+    changed = [dict(g) for g in games]
+    for game in changed[:max(1, int(len(changed) * CHANGE_RATIO))]:
+        game["playtime"] += 30
+    _timed(results, "populate_games.update", model.set_games, changed)
+    app.processEvents()
+    return results
+
+
+# ---- Parent: all sizes ----
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, previous: dict):
+    """Print each scenario's change against an older results file."""
+    print(f"\nCompared with {previous['meta'].get('commit')} ({previous['meta'].get('timestamp')}):")
+    for size, run in current["sizes"].items():
+        old = previous["sizes"].get(size, {}).get("results", {})
+        for name, seconds in run["results"].items():
+            if name in old and old[name] > 0:
+                change = (seconds - old[name]) / old[name] * 100
+                print(f"  {size:>6} {name:<32} {old[name] * 1000:10.1f} -> {seconds * 1000:10.1f} ms ({change:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds added to every API response")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--port", type=int, default=0, help="fixed stand-in port (for record/replay)")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_size(args.child, args.latency, args.port)
+        args.child_output.write_text(json.dumps(result), encoding="utf-8")
+        return
+
+    commit = _commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+        },
+        "sizes": {},
+    }
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"{size} games", flush=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            child_output = Path(tmp) / "result.json"
+            appdata = Path(tmp) / "appdata"
+            appdata.mkdir()
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_library", "--child", str(size),
+                 "--latency", str(args.latency), "--port", str(args.port),
+                 "--child-output", str(child_output)],
+                env={**os.environ, "APPDATA": str(appdata)}, check=True,
+                cwd=Path(__file__).resolve().parent.parent,
+            )
+            report["sizes"][str(size)] = json.loads(child_output.read_text(encoding="utf-8"))
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark the single-pass VDF manifest parser against the old regex scan.
+
+    python -m benchmarks.bench_manifest_parser [count]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# core.db resolves its data folder from APPDATA at import time
+os.environ.setdefault("APPDATA", tempfile.gettempdir())
+
+from core.steam_manifest import read_manifest
+from benchmarks.synthetic_steam import FIRST_APPID, write_manifest
+
+def write_manifests(folder: Path, count: int) -> list[Path]:
+    return [write_manifest(folder, FIRST_APPID + i, with_folder=False) for i in range(count)]
+
+
+def regex_scan(path: Path) -> dict:
+    """The previous approach: one regex pass per field."""
+    data = path.read_text(encoding="utf-8", errors="ignore")
+    appid_match = re.search(r'"appid"\s*"(\d+)"', data)
+    installdir_match = re.search(r'"installdir"\s*"([^"]+)"', data)
+    return {
+        "appid": int(appid_match.group(1)) if appid_match else None,
+        "installdir": installdir_match.group(1) if installdir_match else None,
+    }
+
+
+FIELD_PATTERNS = [
+    re.compile(rf'"{field}"\s*"([^"]*)"', re.IGNORECASE)
+    for field in ("appid", "name", "installdir", "SizeOnDisk", "buildid", "LastUpdated", "StateFlags")
+]
+
+
+def regex_scan_all(path: Path) -> list:
+    """Regex approach extended to the same 7 fields the parser extracts."""
+    data = path.read_text(encoding="utf-8", errors="ignore")
+    return [pattern.search(data) for pattern in FIELD_PATTERNS]
+
+
+def timed(label: str, func, paths: list[Path]) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms  ({elapsed / len(paths) * 1e6:6.1f} us/manifest)")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_manifests(Path(tmp), count)
+        print(f"{count} synthetic manifests")
+        # Warm the OS file cache so both runs measure parsing, not disk
+        timed("warm-up", lambda p: p.read_bytes(), paths)
+        timed("regex (appid, installdir)", regex_scan, paths)
+        timed("regex (7 fields)", regex_scan_all, paths)
+        timed("vdf parser (7 fields)", read_manifest, paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Local stand-in for the Steam Web API, the Steam store, RAWG and their image CDNs,
+with configurable latency. JSON responses carry an ETag and honor If-None-Match.
+
+    api = FakeApi(owned_appids, latency=0.01).start()
+    os.environ.update(api.env())   # before importing core.steam / core.rawg
+    ...
+    api.stop()
+"""
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STEAMID = "76561198000000000"
+
+_NAME_RE = re.compile(r"(\d+)$")
+
+
+def _make_jpeg(width: int, height: int) -> bytes:
+    from PIL import Image  # Pillow is an app dependency; only the image routes need it
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (90, 140, 60)).save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class FakeApi:
+    """
+    Threaded HTTP server on 127.0.0.1. `owned` maps appid -> playtime minutes and can
+    be changed between runs; `requests` counts hits per route.
+    """
+
+    def __init__(self, owned_appids, latency: float = 0.0, port: int = 0):
+        self.owned: dict[int, int] = {appid: appid % 600 for appid in owned_appids}
+        self.latency = latency
+        self.requests = Counter()
+        self._images: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict[str, str]:
+        """Environment that points core.steam / core.rawg at this server."""
+        return {
+            "STEAM_API_URL": self.base_url,
+            "STEAM_STORE_URL": self.base_url,
+            "RAWG_API_URL": f"{self.base_url}/rawg",
+            "STEAM_API_KEY": "bench",
+            "RAWG_API_KEY": "bench",
+        }
+
+    def start(self) -> "FakeApi":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ---- Routes ----
+    def image(self, kind: str) -> bytes:
+        with self._lock:
+            if kind not in self._images:
+                self._images[kind] = _make_jpeg(*((460, 215) if kind == "header" else (1280, 720)))
+            return self._images[kind]
+
+    def route(self, path: str, query: dict) -> tuple[int, str, bytes]:
+        """Return (status, content type, body) for a request."""
+        if path == "/ISteamUser/ResolveVanityURL/v0001/":
+            return self._json({"response": {"success": 1, "steamid": STEAMID}})
+
+        if path == "/IPlayerService/GetOwnedGames/v0001/":
+            games = [
+                {"appid": appid, "name": f"Synthetic Game {appid}", "playtime_forever": playtime,
+                 "rtime_last_played": 1700000000 + playtime}
+                for appid, playtime in sorted(self.owned.items())
+            ]
+            return self._json({"response": {"game_count": len(games), "games": games}})
+
+        if path == "/api/appdetails":
+            appid = query.get("appids", [""])[0]
+            return self._json({appid: {"success": True, "data": {
+                "name": f"Synthetic Game {appid}",
+                "short_description": "A synthetic game for benchmarks.",
+                "header_image": f"{self.base_url}/images/header/{appid}.jpg",
+                "genres": [{"id": "1", "description": "Action"}],
+                "developers": ["Bench Studio"],
+                "publishers": ["Bench Publishing"],
+                "release_date": {"date": "1 Jan, 2024"},
+            }}})
+
+        if path == "/rawg/games":
+            match = _NAME_RE.search(query.get("search", [""])[0])
+            if not match:
+                return self._json({"count": 0, "results": []})
+            rawg_id = int(match.group(1))
+            return self._json({"count": 1, "results": [{
+                "id": rawg_id,
+                "name": f"Synthetic Game {rawg_id}",
+                "background_image": f"{self.base_url}/images/cover/{rawg_id}.jpg",
+            }]})
+
+        if path.startswith("/images/"):
+            kind = path.split("/")[2]
+            return 200, "image/jpeg", self.image(kind)
+
+        return 404, "application/json", b'{"error": "not found"}'
+
+    @staticmethod
+    def _json(data) -> tuple[int, str, bytes]:
+        return 200, "application/json", json.dumps(data).encode("utf-8")
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoints
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                route = url.path.split("/")[1] if url.path.startswith("/images/") else url.path
+                api.requests[route] += 1
+                if api.latency:
+                    time.sleep(api.latency)
+
+                status, content_type, body = api.route(url.path, parse_qs(url.query))
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Quiet: benchmarks print their own summary
+
+        return Handler
@@ -0,0 +1,96 @@
+"""
+Synthetic Steam installs for benchmarks: a Steam root plus extra libraries,
+each with appmanifest_*.acf files, common/ game folders and a libraryfolders.vdf.
+"""
+from pathlib import Path
+
+FIRST_APPID = 100000
+
+MANIFEST_TEMPLATE = '''"AppState"
+{{
+\t"appid"\t\t"{appid}"
+\t"Universe"\t\t"1"
+\t"name"\t\t"Synthetic Game {appid}"
+\t"StateFlags"\t\t"4"
+\t"installdir"\t\t"SyntheticGame{appid}"
+\t"LastUpdated"\t\t"1700000000"
+\t"SizeOnDisk"\t\t"{size}"
+\t"buildid"\t\t"{buildid}"
+\t"LastOwner"\t\t"76561198000000000"
+\t"InstalledDepots"
+\t{{
+\t\t"{depot}"
+\t\t{{
+\t\t\t"manifest"\t\t"1234567890123456789"
+\t\t\t"size"\t\t"{size}"
+\t\t}}
+\t}}
+\t"UserConfig"
+\t{{
+\t\t"language"\t\t"english"
+\t}}
+\t"MountedConfig"
+\t{{
+\t\t"language"\t\t"english"
+\t}}
+}}
+'''
+
+
+def game_name(appid: int) -> str:
+    return f"Synthetic Game {appid}"
+
+
+def manifest_path(steamapps: Path, appid: int) -> Path:
+    return steamapps / f"appmanifest_{appid}.acf"
+
+
+def write_manifest(steamapps: Path, appid: int, with_folder: bool = True) -> Path:
+    """Write one installed-game manifest (and its common/ folder)."""
+    path = manifest_path(steamapps, appid)
+    path.write_text(MANIFEST_TEMPLATE.format(
+        appid=appid, size=appid * 1024, buildid=appid * 3, depot=appid + 1
+    ), encoding="utf-8")
+    if with_folder:
+        (steamapps / "common" / f"SyntheticGame{appid}").mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_libraryfolders(steam_root: Path, libraries: list[Path]):
+    """Modern libraryfolders.vdf listing every library (the root included)."""
+    entries = []
+    for i, lib in enumerate(libraries):
+        path = str(lib).replace("\\", "\\\\")
+        entries.append(f'\t"{i}"\n\t{{\n\t\t"path"\t\t"{path}"\n\t\t"label"\t\t""\n\t}}\n')
+    vdf = '"libraryfolders"\n{\n' + "".join(entries) + "}\n"
+    (steam_root / "steamapps" / "libraryfolders.vdf").write_text(vdf, encoding="utf-8")
+
+
+def generate_steam_root(base: Path, games: int, libraries: int = 3,
+                        first_appid: int = FIRST_APPID) -> dict:
+    """
+    Create `base`/steam (the Steam root) plus `libraries - 1` extra libraries and
+    spread `games` installed games across them round-robin.
+    Returns {"root", "libraries", "steamapps": {appid: steamapps dir}, "appids"}.
+    """
+    root = base / "steam"
+    libs = [root] + [base / f"library{i}" for i in range(1, libraries)]
+    for lib in libs:
+        (lib / "steamapps" / "common").mkdir(parents=True, exist_ok=True)
+    write_libraryfolders(root, libs)
+
+    steamapps = {}
+    for i in range(games):
+        appid = first_appid + i
+        folder = libs[i % len(libs)] / "steamapps"
+        write_manifest(folder, appid)
+        steamapps[appid] = folder
+
+    return {"root": root, "libraries": libs, "steamapps": steamapps,
+            "appids": list(range(first_appid, first_appid + games))}
+
+
+def uninstall(steam: dict, appids) -> None:
+    """Remove the manifests of some generated games (as Steam does on uninstall)."""
+    for appid in appids:
+        manifest_path(steam["steamapps"][appid], appid).unlink(missing_ok=True)
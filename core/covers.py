@@ -0,0 +1,78 @@
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image
+from core.db import COVERS_DIR, rendition_path
+
+# Renditions generated for every cover: the square list icon (ui.thumbnails.THUMBNAIL_SIZE).
+# {appid}.webp itself keeps the downloaded resolution.
+THUMBNAIL_SIZES = (64,)
+WEBP_QUALITY = 80
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def render_cover(content: bytes, appid: int, save_cover: bool = True) -> tuple[str, list[int]]:
+    """
+    Decode a cover once and write it as WEBP: {appid}.webp at full resolution
+    (unless save_cover is False, for covers already on disk) and {appid}_<size>.webp
+    thumbnails. Returns (cover path, rendition sizes written). Runs inside a worker process.
+    """
+    img = Image.open(io.BytesIO(content))
+    cover_path = COVERS_DIR / f"{appid}.webp"
+
+    if not save_cover:
+        # JPEG: only the thumbnails are needed, let the decoder downscale by 1/2, 1/4 or 1/8
+        largest = max(THUMBNAIL_SIZES)
+        img.draft("RGB", (largest, largest))
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+
+    COVERS_DIR.mkdir(parents=True, exist_ok=True)
+    if save_cover:
+        img.save(cover_path, "WEBP", quality=WEBP_QUALITY)
+
+    sizes = []
+    for size in THUMBNAIL_SIZES:
+        # Square like the list icons have always been
+        thumb = img.resize((size, size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+        thumb.save(rendition_path(appid, size), "WEBP", quality=WEBP_QUALITY)
+        sizes.append(size)
+
+    return str(cover_path), sizes
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Reached from every fetch_covers worker thread at once on the first import
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+        return _pool
+
+
+def _drop_pool(pool: ProcessPoolExecutor):
+    """Forget a broken pool (once, even when several threads saw it break)."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def encode_cover(content: bytes, appid: int, save_cover: bool = True) -> tuple[str, list[int]]:
+    """Render cover renditions in the shared process pool (in-process if the pool is unavailable)."""
+    pool = _get_pool()
+    try:
+        return pool.submit(render_cover, content, appid, save_cover).result()
+    except BrokenProcessPool:
+        _drop_pool(pool)
+        return render_cover(content, appid, save_cover)
+
+
+def available_renditions(appid: int) -> list[int]:
+    """Rendition sizes present on disk for a cover (covers saved before renditions have none)."""
+    return [size for size in THUMBNAIL_SIZES if os.path.exists(rendition_path(appid, size))]
@@ -1,21 +1,62 @@
 import sqlite3
+import difflib
+import json
+import re
+import unicodedata
+import threading
+import time
 from pathlib import Path
 import os
+from core.metrics import get_logger, span
+
+log = get_logger("DB")
 
 # Base folder in Roaming
 APPDATA_DIR = Path(os.getenv("APPDATA")) / "Avocado Game Launcher" / "data"
 DB_PATH = APPDATA_DIR / "games.db"
 COVERS_DIR = APPDATA_DIR / "covers"
 
-def init_db():
-    """Initialize the database and folders if they don't exist."""
-    APPDATA_DIR.mkdir(parents=True, exist_ok=True)  # Ensure data/ exists
-    COVERS_DIR.mkdir(parents=True, exist_ok=True)  # Ensure covers/ exists
+def rendition_path(appid: int, size: int) -> str:
+    """Path of a pre-scaled cover rendition (see core.covers)."""
+    return str(COVERS_DIR / f"{appid}_{size}.webp")
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+# One connection per thread, opened on first use and reused for the process lifetime
+_local = threading.local()
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return this thread's shared connection (WAL journal, tuned pragmas).
+    Use `with get_connection() as conn:` for a transaction that commits or rolls back.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        APPDATA_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+        conn.execute("PRAGMA cache_size=-16000")  # ~16 MB page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _local.conn = conn
+    return conn
 
-    cursor.execute("""
+def close_connection():
+    """Close this thread's connection, if open."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+# ---- Schema migrations (tracked with PRAGMA user_version) ----
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+    """Add a column unless it already exists."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in existing:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def _migration_1(conn: sqlite3.Connection):
+    """Games table (databases created before migrations may lack 'installed')."""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS games (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             appid INTEGER UNIQUE,
@@ -25,79 +66,571 @@ def init_db():
             installed INTEGER DEFAULT 0
         )
     """)
+    _add_column(conn, "games", "installed", "INTEGER DEFAULT 0")
+
+def _migration_2(conn: sqlite3.Connection):
+    """Local caches: RAWG lookups, Steam appdetails and the manifest scan index."""
+    # RAWG lookup cache: rawg_id/image_url NULL means "no result"
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rawg_cache (
+            appid INTEGER PRIMARY KEY,
+            rawg_id INTEGER,
+            image_url TEXT,
+            fetched_at REAL NOT NULL
+        )
+    """)
+
+    # Normalized Steam appdetails (list fields stored as JSON)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS game_details (
+            appid INTEGER PRIMARY KEY,
+            name TEXT,
+            description TEXT,
+            genres TEXT,
+            developers TEXT,
+            publishers TEXT,
+            release_date TEXT,
+            header_image TEXT,
+            last_fetched REAL NOT NULL
+        )
+    """)
+
+    # Steam manifest scan index: parsed fields keyed by manifest path + (mtime, size)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS manifest_index (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            appid INTEGER,
+            installdir TEXT,
+            installed INTEGER DEFAULT 0
+        )
+    """)
+    for column, definition in (("name", "TEXT"), ("size_on_disk", "INTEGER"), ("buildid", "INTEGER"),
+                               ("last_updated", "INTEGER"), ("state_flags", "INTEGER")):
+        _add_column(conn, "manifest_index", column, definition)
 
-    # Add 'installed' column if missing
-    try:
-        cursor.execute("ALTER TABLE games ADD COLUMN installed INTEGER DEFAULT 0")
-    except sqlite3.OperationalError:
-        pass
+def _migration_3(conn: sqlite3.Connection):
+    """Last-played tracking and indexes for library filtering/sorting."""
+    _add_column(conn, "games", "last_played", "INTEGER DEFAULT 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_installed ON games(installed)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_name ON games(lower(name))")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_playtime ON games(playtime)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_last_played ON games(last_played)")
 
-    conn.commit()
-    conn.close()
+def _migration_4(conn: sqlite3.Connection):
+    """Full-text search over names + cached appdetails text, kept in sync by triggers."""
+    # remove_diacritics folds accents, so "pokemon" finds "Pokémon" and "canon" finds "Cañón"
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+            name, description, genres, developers,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
 
+    index_game = """
+        INSERT INTO games_fts (rowid, name, description, genres, developers)
+        SELECT new.appid, new.name, d.description, d.genres, d.developers
+        FROM (SELECT 1) LEFT JOIN game_details d ON d.appid = new.appid;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS games_fts_insert AFTER INSERT ON games BEGIN
+            {index_game}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS games_fts_update AFTER UPDATE OF name ON games
+        WHEN old.name IS NOT new.name BEGIN
+            DELETE FROM games_fts WHERE rowid = old.appid;
+            {index_game}
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS games_fts_delete AFTER DELETE ON games BEGIN
+            DELETE FROM games_fts WHERE rowid = old.appid;
+        END
+    """)
+
+    index_details = """
+        DELETE FROM games_fts WHERE rowid = new.appid;
+        INSERT INTO games_fts (rowid, name, description, genres, developers)
+        SELECT g.appid, g.name, new.description, new.genres, new.developers
+        FROM games g WHERE g.appid = new.appid;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS game_details_fts_insert AFTER INSERT ON game_details BEGIN
+            {index_details}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS game_details_fts_update AFTER UPDATE ON game_details BEGIN
+            {index_details}
+        END
+    """)
+
+    # Index existing rows
+    conn.execute("DELETE FROM games_fts")
+    conn.execute("""
+        INSERT INTO games_fts (rowid, name, description, genres, developers)
+        SELECT g.appid, g.name, d.description, d.genres, d.developers
+        FROM games g LEFT JOIN game_details d ON d.appid = g.appid
+    """)
+
+def _migration_5(conn: sqlite3.Connection):
+    """Which pre-scaled cover renditions exist (comma-separated sizes)."""
+    _add_column(conn, "games", "renditions", "TEXT")
+
+def _migration_6(conn: sqlite3.Connection):
+    """HTTP response cache (bodies + validators) for conditional requests and offline mode."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            content_type TEXT,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache(accessed_at)")
+
+# Append new migrations here; never edit one that has shipped
+MIGRATIONS = [_migration_1, _migration_2, _migration_3, _migration_4, _migration_5, _migration_6]
+
+@span("db.init")
+def init_db():
+    """Initialize folders and run pending schema migrations."""
+    APPDATA_DIR.mkdir(parents=True, exist_ok=True)  # Ensure data/ exists
+    COVERS_DIR.mkdir(parents=True, exist_ok=True)  # Ensure covers/ exists
+
+    conn = get_connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        # Explicit BEGIN so DDL and the version bump commit (or roll back) together
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        log.info("Applied migration %d", number)
+
+@span("db.save_games")
 def save_games(games: list[dict]):
     """
-    Insert or update games in the database.
+    Insert or update games in the database, in a single transaction.
     Store the local cover path (inside Roaming/data/covers) and installation status.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
+    rows = []
     for game in games:
-        print(f"[DB] Saving game: {game.get('name')} ({game.get('appid')})")
-
         # If the cover exists locally, normalize path under covers/
         cover_path = game.get("cover")
         if cover_path and not cover_path.startswith(str(COVERS_DIR)):
             cover_path = str(COVERS_DIR / f"{game.get('appid')}.jpg")
 
-        cursor.execute("""
-            INSERT INTO games (appid, name, playtime, cover, installed)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(appid) DO UPDATE SET
-                name = excluded.name,
-                playtime = excluded.playtime,
-                cover = excluded.cover,
-                installed = excluded.installed
-        """, (
+        rows.append((
             game.get("appid"),
             game.get("name"),
             game.get("playtime", 0),
             cover_path,
-            1 if game.get("installed") else 0 
+            1 if game.get("installed") else 0,
+            game.get("last_played"),
+            ",".join(str(size) for size in game["renditions"]) if game.get("renditions") is not None else None
         ))
 
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.executemany("""
+            INSERT INTO games (appid, name, playtime, cover, installed, last_played, renditions)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(appid) DO UPDATE SET
+                name = excluded.name,
+                playtime = excluded.playtime,
+                cover = excluded.cover,
+                installed = excluded.installed,
+                last_played = COALESCE(excluded.last_played, games.last_played),
+                renditions = COALESCE(excluded.renditions, games.renditions)
+        """, rows)
+
+    _invalidate_name_terms()
+    log.debug("Saved %d games", len(rows))
+
+GAME_COLUMNS = "appid, name, playtime, cover, installed, last_played, renditions"
 
+# Sort keys for query_games, each backed by an index
+GAME_ORDERS = {
+    "name": "lower(name)",
+    "playtime": "playtime DESC",
+    "last_played": "last_played DESC",
+}
+
+def _game_from_row(r) -> dict:
+    return {
+        "appid": r[0],
+        "name": r[1],
+        "playtime": r[2],
+        "cover": r[3],
+        "installed": bool(r[4]),
+        "last_played": r[5] or 0,
+        "renditions": [int(size) for size in r[6].split(",") if size] if r[6] else []
+    }
+
+@span("db.load_games")
 def load_games() -> list[dict]:
     """Load all games from the database."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT appid, name, playtime, cover, installed FROM games")
+    cursor.execute(f"SELECT {GAME_COLUMNS} FROM games")
     rows = cursor.fetchall()
-    conn.close()
-
-    return [
-        {
-            "appid": r[0],
-            "name": r[1],
-            "playtime": r[2],
-            "cover": r[3],
-            "installed": bool(r[4])
-        }
-        for r in rows
-    ]
+
+    return [_game_from_row(r) for r in rows]
+
+def query_games(installed: bool | None = None, name_prefix: str | None = None,
+                order_by: str = "name", limit: int | None = None, offset: int = 0) -> list[dict]:
+    """
+    Filter and sort games in SQL (using the games indexes) instead of in Python.
+    order_by is one of GAME_ORDERS.
+    """
+    where, params = [], []
+    if installed is not None:
+        where.append("installed = ?")
+        params.append(1 if installed else 0)
+    if name_prefix:
+        # Range scan on the lower(name) index
+        prefix = name_prefix.lower()
+        where.append("lower(name) >= ? AND lower(name) < ?")
+        params += [prefix, prefix + "\uffff"]
+
+    sql = f"SELECT {GAME_COLUMNS} FROM games"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {GAME_ORDERS.get(order_by, GAME_ORDERS['name'])}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+    cursor = get_connection().execute(sql, params)
+    return [_game_from_row(r) for r in cursor.fetchall()]
+
+def _fold(text: str) -> str:
+    """Lowercase and strip diacritics, matching the FTS tokenizer."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+def _fts_search(match: str, limit: int) -> list[dict]:
+    cursor = get_connection().execute("""
+        SELECT g.appid, g.name, g.playtime, g.cover, g.installed, g.last_played, g.renditions
+        FROM games_fts JOIN games g ON g.appid = games_fts.rowid
+        WHERE games_fts MATCH ?
+        ORDER BY bm25(games_fts, 10.0, 1.0, 2.0, 2.0)
+        LIMIT ?
+    """, (match, limit))
+    return [_game_from_row(r) for r in cursor.fetchall()]
+
+def _match_expression(query: str) -> str | None:
+    """
+    FTS MATCH expression for a search box query: every word as a prefix, or, if
+    that finds nothing, each word replaced by its closest words from game names.
+    None when nothing can match.
+    """
+    terms = re.findall(r"\w+", _fold(query))
+    if not terms:
+        return None
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    if get_connection().execute("SELECT 1 FROM games_fts WHERE games_fts MATCH ? LIMIT 1", (match,)).fetchone():
+        return match
+
+    # Fuzzy fallback against the words of game names
+    groups = []
+    for term in terms:
+        close = _close_name_terms(term)
+        if not close:
+            return None
+        groups.append("(" + " OR ".join(f'"{word}"' for word in close) + ")")
+    return " AND ".join(groups)
+
+@span("db.search")
+def search_games(query: str, limit: int = 500) -> list[dict]:
+    """
+    Full-text search over game names and cached appdetails (description, genres, developers).
+    Every word is matched as a prefix, ignoring case and accents. If nothing matches,
+    each word is replaced by its closest words from game names, so small typos still find results.
+    Results are ordered by relevance; at most `limit` are returned.
+    """
+    match = _match_expression(query)
+    return _fts_search(match, limit) if match else []
+
+@span("db.search_appids")
+def search_appids(query: str) -> set[int]:
+    """Appids of every game matching `query` (as search_games, unranked and unlimited); for list filters."""
+    match = _match_expression(query)
+    if not match:
+        return set()
+    cursor = get_connection().execute("SELECT rowid FROM games_fts WHERE games_fts MATCH ?", (match,))
+    return {r[0] for r in cursor}
+
+# Bigram index over the words of game names, rebuilt after games change.
+# Only names are used for typo correction: the description vocabulary is much larger.
+_name_terms_version = 0
+_name_terms: tuple[int, dict[str, set[str]]] | None = None
+
+def _invalidate_name_terms():
+    global _name_terms_version
+    _name_terms_version += 1
+
+def _bigrams(word: str) -> set[str]:
+    # Padded, so short words with swapped letters ("gmae") still share their ends
+    padded = f" {word} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+def _name_term_index() -> dict[str, set[str]]:
+    """bigram -> name words containing it (cached per games version)."""
+    global _name_terms
+    cached = _name_terms
+    if cached is not None and cached[0] == _name_terms_version:
+        return cached[1]
+
+    version = _name_terms_version
+    words = set()
+    for (name,) in get_connection().execute("SELECT name FROM games"):
+        words.update(re.findall(r"\w+", _fold(name or "")))
+    index: dict[str, set[str]] = {}
+    for word in words:
+        for gram in _bigrams(word):
+            index.setdefault(gram, set()).add(word)
+    _name_terms = (version, index)
+    return index
+
+def _close_name_terms(term: str, n: int = 3, cutoff: float = 0.75) -> list[str]:
+    """Name words within a few typos of `term`; only words sharing a bigram are compared."""
+    index = _name_term_index()
+    candidates = set()
+    for gram in _bigrams(term):
+        candidates |= index.get(gram, set())
+    return difflib.get_close_matches(term, candidates, n=n, cutoff=cutoff)
+
+@span("db.set_installed")
+def set_installed(appids: set[int], installed: bool) -> int:
+    """Update the 'installed' flag for existing games. Returns the number of rows updated."""
+    if not appids:
+        return 0
+    with get_connection() as conn:
+        cur = conn.executemany("UPDATE games SET installed = ? WHERE appid = ?",
+                               [(1 if installed else 0, appid) for appid in appids])
+    return cur.rowcount
+
+def load_game_states() -> dict[int, tuple[int, int, bool]]:
+    """appid -> (playtime, last_played, installed) for every stored game."""
+    cur = get_connection().execute("SELECT appid, playtime, last_played, installed FROM games")
+    return {r[0]: (r[1] or 0, r[2] or 0, bool(r[3])) for r in cur}
+
+@span("db.update_play_stats")
+def update_play_stats(rows: list[tuple[int, int, int]]):
+    """Update playtime and last_played of existing games from (appid, playtime, last_played) rows."""
+    if not rows:
+        return
+    with get_connection() as conn:
+        conn.executemany("UPDATE games SET playtime = ?, last_played = ? WHERE appid = ?",
+                         [(playtime, last_played, appid) for appid, playtime, last_played in rows])
+
+@span("db.delete_games")
+def delete_games(appids: set[int]):
+    """Delete several games in one transaction. Cover files are kept for a later re-import."""
+    if not appids:
+        return
+    with get_connection() as conn:
+        conn.executemany("DELETE FROM games WHERE appid = ?", [(appid,) for appid in appids])
+    _invalidate_name_terms()
 
 def delete_game(appid: int):
     """Delete a game by appid from database and its cover if exists."""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("DELETE FROM games WHERE appid = ?", (appid,))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM games WHERE appid = ?", (appid,))
+    _invalidate_name_terms()
 
     cover_file = COVERS_DIR / f"{appid}.jpg"
     if cover_file.exists():
         cover_file.unlink()
+
+
+def get_rawg_lookup(appid: int) -> dict | None:
+    """Return the cached RAWG lookup for an appid, or None if never looked up."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT rawg_id, image_url, fetched_at FROM rawg_cache WHERE appid = ?", (appid,))
+    row = cur.fetchone()
+
+    if not row:
+        return None
+    return {"rawg_id": row[0], "image_url": row[1], "fetched_at": row[2]}
+
+def save_rawg_lookup(appid: int, rawg_id: int | None, image_url: str | None):
+    """Store a RAWG lookup result. Pass None for both to remember a miss."""
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO rawg_cache (appid, rawg_id, image_url, fetched_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(appid) DO UPDATE SET
+                rawg_id = excluded.rawg_id,
+                image_url = excluded.image_url,
+                fetched_at = excluded.fetched_at
+        """, (appid, rawg_id, image_url, time.time()))
+
+def get_game_details(appid: int) -> dict | None:
+    """Return stored appdetails for an appid (with 'last_fetched'), or None."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT name, description, genres, developers, publishers,
+               release_date, header_image, last_fetched
+        FROM game_details WHERE appid = ?
+    """, (appid,))
+    row = cur.fetchone()
+
+    if not row:
+        return None
+    return {
+        "name": row[0],
+        "description": row[1],
+        "genres": json.loads(row[2] or "[]"),
+        "developers": json.loads(row[3] or "[]"),
+        "publishers": json.loads(row[4] or "[]"),
+        "release_date": row[5],
+        "header_image": row[6],
+        "last_fetched": row[7],
+    }
+
+def save_game_details(appid: int, details: dict):
+    """Insert or update normalized appdetails for an appid."""
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO game_details (appid, name, description, genres, developers,
+                                      publishers, release_date, header_image, last_fetched)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(appid) DO UPDATE SET
+                name = excluded.name,
+                description = excluded.description,
+                genres = excluded.genres,
+                developers = excluded.developers,
+                publishers = excluded.publishers,
+                release_date = excluded.release_date,
+                header_image = excluded.header_image,
+                last_fetched = excluded.last_fetched
+        """, (
+            appid,
+            details.get("name"),
+            details.get("description"),
+            json.dumps(details.get("genres") or [], ensure_ascii=False),
+            json.dumps(details.get("developers") or [], ensure_ascii=False),
+            json.dumps(details.get("publishers") or [], ensure_ascii=False),
+            details.get("release_date"),
+            details.get("header_image"),
+            time.time()
+        ))
+
+MANIFEST_INDEX_FIELDS = ("appid", "name", "installdir", "size_on_disk", "buildid", "last_updated", "state_flags")
+
+def load_manifest_index() -> dict[str, dict]:
+    """Load the manifest scan index as {path: entry}."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"SELECT path, mtime, size, installed, {', '.join(MANIFEST_INDEX_FIELDS)} FROM manifest_index")
+    rows = cur.fetchall()
+
+    return {
+        r[0]: {
+            "mtime": r[1],
+            "size": r[2],
+            "installed": bool(r[3]),
+            **dict(zip(MANIFEST_INDEX_FIELDS, r[4:]))
+        }
+        for r in rows
+    }
+
+@span("db.save_manifest_index")
+def save_manifest_index(entries: dict[str, dict], removed: set[str] | None = None):
+    """Upsert changed index entries and drop the ones for deleted manifests."""
+    columns = ("path", "mtime", "size", "installed") + MANIFEST_INDEX_FIELDS
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.executemany(f"""
+            INSERT INTO manifest_index ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT(path) DO UPDATE SET
+                {', '.join(f'{c} = excluded.{c}' for c in columns[1:])}
+        """, [
+            (path, e["mtime"], e["size"], 1 if e["installed"] else 0,
+             *(e.get(field) for field in MANIFEST_INDEX_FIELDS))
+            for path, e in entries.items()
+        ])
+        if removed:
+            cur.executemany("DELETE FROM manifest_index WHERE path = ?", [(p,) for p in removed])
+
+
+def get_http_response(key: str) -> dict | None:
+    """Return a cached HTTP response by cache key (and mark it as recently used), or None."""
+    with get_connection() as conn:
+        row = conn.execute("""
+            SELECT url, etag, last_modified, content_type, body, fetched_at
+            FROM http_cache WHERE key = ?
+        """, (key,)).fetchone()
+        if not row:
+            return None
+        conn.execute("UPDATE http_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+    return {
+        "url": row[0],
+        "etag": row[1],
+        "last_modified": row[2],
+        "content_type": row[3],
+        "body": row[4],
+        "fetched_at": row[5],
+    }
+
+@span("db.save_http_response")
+def save_http_response(key: str, url: str, body: bytes, etag: str | None = None,
+                       last_modified: str | None = None, content_type: str | None = None):
+    """Store (or replace) a cached HTTP response."""
+    now = time.time()
+    with get_connection() as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO http_cache
+                (key, url, etag, last_modified, content_type, body, size, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (key, url, etag, last_modified, content_type, body, len(body), now, now))
+
+def touch_http_response(key: str):
+    """Mark a cached response as revalidated (304 Not Modified)."""
+    now = time.time()
+    with get_connection() as conn:
+        conn.execute("UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+def http_cache_size() -> int:
+    """Total cached body bytes."""
+    return get_connection().execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+def evict_http_cache(max_bytes: int) -> int:
+    """Drop least recently used responses until the cache fits in max_bytes. Returns bytes freed."""
+    total = http_cache_size()
+    freed = 0
+    if total <= max_bytes:
+        return 0
+    with get_connection() as conn:
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM http_cache ORDER BY accessed_at"):
+            if total - freed <= max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM http_cache WHERE key = ?", victims)
+    return freed
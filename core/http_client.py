@@ -0,0 +1,232 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from core.db import (get_http_response, save_http_response, touch_http_response,
+                     evict_http_cache)
+from core.manager import get_setting
+from core.metrics import get_logger, span, count
+from core.http_transport import MissingFixture, transport_from_env
+
+log = get_logger("HTTP")
+
+# Defaults for every outgoing request
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) seconds
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Concurrency: max requests in flight per host (override with set_host_limit)
+HOST_LIMIT = 4
+_host_limits: dict[str, int] = {}
+
+# Persistent response cache (requests made with cache=True)
+HTTP_CACHE_BYTES = 64 * 1024 * 1024
+
+# Adapter factory `(pool_maxsize) -> adapter` replacing the network (see core.http_transport)
+_transport = transport_from_env()
+
+# Retry jitter; seeded (AVOCADO_HTTP_SEED or set_transport) so replayed runs sleep the same
+_jitter = random.Random(int(os.environ["AVOCADO_HTTP_SEED"]) if os.getenv("AVOCADO_HTTP_SEED") else None)
+
+_sessions: dict[str, requests.Session] = {}
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+
+def set_host_limit(host: str, limit: int):
+    """Set the max parallel requests for a host. Applies to hosts not contacted yet."""
+    with _lock:
+        _host_limits[host] = max(1, limit)
+        _host_slots.pop(host, None)
+
+
+def set_transport(factory, seed: int | None = None):
+    """
+    Send every request through adapters made by `factory(pool_maxsize)`, e.g.
+    `lambda size: ReplayTransport("fixtures")`. None restores the real network.
+    Pooled sessions are dropped so the change applies to all hosts.
+    `seed` makes the retry backoff jitter repeatable.
+    """
+    global _transport
+    with _lock:
+        _transport = factory
+        _jitter.seed(seed)
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _session(host: str) -> requests.Session:
+    """Return the pooled keep-alive session for a host."""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            limit = _host_limits.get(host, HOST_LIMIT)
+            if _transport is not None:
+                adapter = _transport(limit)
+            else:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def _host_slot(host: str) -> threading.BoundedSemaphore:
+    with _lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(_host_limits.get(host, HOST_LIMIT))
+        return slot
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return _jitter.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def is_offline() -> bool:
+    """Offline mode (the `offline` setting): no network, cached responses only."""
+    return bool(get_setting("offline", False))
+
+
+def _cache_key(url: str, params: dict | None) -> str:
+    full_url = requests.Request("GET", url, params=params).prepare().url
+    return hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+
+
+def _cached_response(entry: dict, url: str) -> requests.Response:
+    """Build a 200 response from a cache entry. `resp.from_cache` is True."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.url = url
+    resp._content = entry["body"]
+    resp.headers = CaseInsensitiveDict({
+        name: value for name, value in (
+            ("Content-Type", entry["content_type"]),
+            ("ETag", entry["etag"]),
+            ("Last-Modified", entry["last_modified"]),
+        ) if value
+    })
+    resp.from_cache = True
+    return resp
+
+
+def get(url: str, params: dict | None = None, timeout=DEFAULT_TIMEOUT,
+        retries: int = MAX_RETRIES, cache: bool = False, **kwargs) -> requests.Response:
+    """
+    GET through the shared per-host session (see _fetch for retries).
+
+    With cache=True the response body is stored with its ETag/Last-Modified and
+    later requests revalidate with If-None-Match/If-Modified-Since; a 304 is served
+    from the cache. The cached copy is also served when the network fails, and it
+    is the only source in offline mode.
+    Without cache, offline mode raises requests.ConnectionError right away.
+    """
+    if not cache:
+        if is_offline():
+            raise requests.ConnectionError(f"Offline mode: {url}")
+        return _fetch(url, params, timeout, retries, **kwargs)
+
+    key = _cache_key(url, params)
+    entry = get_http_response(key)
+    if is_offline():
+        if entry is None:
+            raise requests.ConnectionError(f"Offline mode, not cached: {url}")
+        count("http.cache.offline_hit")
+        return _cached_response(entry, url)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        resp = _fetch(url, params, timeout, retries, headers=headers, **kwargs)
+    except (requests.ConnectionError, requests.Timeout):
+        if entry is None:
+            raise
+        log.warning("Network error, serving cached %s", url)
+        count("http.cache.stale")
+        return _cached_response(entry, url)
+
+    if resp.status_code == 304 and entry is not None:
+        count("http.cache.revalidated")
+        touch_http_response(key)
+        return _cached_response(entry, url)
+    if resp.status_code == 200:
+        count("http.cache.miss" if entry is None else "http.cache.changed")
+        save_http_response(key, url, resp.content,
+                           etag=resp.headers.get("ETag"),
+                           last_modified=resp.headers.get("Last-Modified"),
+                           content_type=resp.headers.get("Content-Type"))
+        evict_http_cache(HTTP_CACHE_BYTES)
+    elif resp.status_code >= 500 and entry is not None:
+        count("http.cache.stale")
+        return _cached_response(entry, url)
+    return resp
+
+
+def _fetch(url: str, params: dict | None, timeout, retries: int, **kwargs) -> requests.Response:
+    """
+    GET through the shared per-host session.
+    Retries connection errors, timeouts and 429/5xx responses with backoff,
+    honoring Retry-After. The last response is returned (or the last error raised).
+    A missing replay fixture is raised at once.
+    """
+    host = urlparse(url).netloc
+    session = _session(host)
+
+    attempt = 0
+    while True:
+        try:
+            with _host_slot(host), span(f"http.{host}"):
+                resp = session.get(url, params=params, timeout=timeout, **kwargs)
+            count("http.requests")
+            count("http.bytes", len(resp.content))
+        except MissingFixture:
+            raise
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+            delay = _backoff(attempt)
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                return resp
+            delay = _retry_after(resp)
+            if delay is None:
+                delay = _backoff(attempt)
+            delay = min(delay, BACKOFF_MAX)
+            resp.close()
+
+        count("http.retries")
+        log.info("Retrying %s in %.1fs (attempt %d/%d)", host, delay, attempt + 1, retries)
+        time.sleep(delay)
+        attempt += 1
@@ -0,0 +1,195 @@
+"""
+Pluggable transports mounted under http_client's sessions (requests transport adapters).
+
+  RecordTransport  real network; every response is also saved as a fixture file
+  ReplayTransport  no network; responses come from fixture files, with optional
+                   injected latency and error rate
+
+Fixtures are JSON files under <fixtures>/<host>/, one per request (method + URL
+with API keys stripped), so they can be committed and reviewed. Select a transport
+with http_client.set_transport() or the environment:
+
+    AVOCADO_HTTP_TRANSPORT=record|replay
+    AVOCADO_HTTP_FIXTURES=path/to/fixtures
+    AVOCADO_HTTP_LATENCY=0.05          (replay: seconds per request)
+    AVOCADO_HTTP_ERROR_RATE=0.1        (replay: share of requests that fail)
+    AVOCADO_HTTP_ERROR_STATUS=503      (replay: fail with this status instead of a connection error)
+    AVOCADO_HTTP_SEED=42               (replay: repeatable injected errors and retry backoff)
+"""
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from core.metrics import get_logger, count
+
+log = get_logger("HTTP")
+
+# Query parameters never written to fixtures nor used for matching
+SECRET_PARAMS = {"key"}
+
+# Response headers kept in fixtures
+FIXTURE_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+class MissingFixture(requests.ConnectionError):
+    """No fixture recorded for a replayed request. Never retried: replaying again cannot help."""
+
+
+def _sanitized_url(url: str) -> str:
+    """URL without secret params and with sorted query, so fixtures match across keys."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def fixture_path(fixtures_dir, method: str, url: str) -> Path:
+    clean = _sanitized_url(url)
+    digest = hashlib.sha1(f"{method} {clean}".encode("utf-8")).hexdigest()[:16]
+    host = urlsplit(clean).netloc.replace(":", "_") or "_"
+    return Path(fixtures_dir) / host / f"{method.lower()}_{digest}.json"
+
+
+def save_fixture(fixtures_dir, request: requests.PreparedRequest, resp: requests.Response):
+    headers = {name: resp.headers[name] for name in FIXTURE_HEADERS if name in resp.headers}
+    fixture = {"method": request.method, "url": _sanitized_url(request.url),
+               "status": resp.status_code, "headers": headers}
+    content_type = headers.get("Content-Type", "")
+    body = None
+    if "json" in content_type or content_type.startswith("text/"):
+        # Readable text only when it round-trips exactly; load_fixture encodes it back as UTF-8
+        try:
+            body = resp.content.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+    if body is not None:
+        fixture["body"] = body
+    else:
+        fixture["body_base64"] = base64.b64encode(resp.content).decode("ascii")
+
+    path = fixture_path(fixtures_dir, request.method, request.url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(fixture, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_fixture(fixtures_dir, method: str, url: str) -> dict | None:
+    path = fixture_path(fixtures_dir, method, url)
+    try:
+        fixture = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if "body_base64" in fixture:
+        fixture["content"] = base64.b64decode(fixture["body_base64"])
+    else:
+        fixture["content"] = fixture.get("body", "").encode("utf-8")
+    return fixture
+
+
+class RecordTransport(HTTPAdapter):
+    """Real network; successful and error responses are saved as fixtures (304s are not)."""
+
+    def __init__(self, fixtures_dir, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures_dir = fixtures_dir
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        if resp.status_code != 304:  # Keep the full body recorded earlier
+            save_fixture(self.fixtures_dir, request, resp)
+            count("transport.recorded")
+        return resp
+
+
+class ReplayTransport(BaseAdapter):
+    """
+    Serves fixtures instead of the network. Missing fixtures raise MissingFixture.
+    `error_rate` of the requests fail: with `error_status` as the response status, or
+    as a ConnectionError when it is None. `seed` makes the injected errors repeatable.
+    """
+
+    def __init__(self, fixtures_dir, latency: float = 0.0, error_rate: float = 0.0,
+                 error_status: int | None = None, seed: int | None = None):
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _fails(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    @staticmethod
+    def _response(request, status: int, headers: dict, content: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict(headers)
+        resp._content = content
+        resp.url = request.url
+        resp.request = request
+        resp.reason = "Replayed"
+        return resp
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self._fails():
+            count("transport.injected_errors")
+            if self.error_status:
+                return self._response(request, self.error_status, {}, b"")
+            raise requests.ConnectionError(f"Injected failure: {_sanitized_url(request.url)}", request=request)
+
+        fixture = load_fixture(self.fixtures_dir, request.method, request.url)
+        if fixture is None:
+            count("transport.missing_fixtures")
+            raise MissingFixture(f"No fixture for {request.method} {_sanitized_url(request.url)}",
+                                 request=request)
+
+        count("transport.replayed")
+        etag = fixture["headers"].get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return self._response(request, 304, {"ETag": etag}, b"")
+        return self._response(request, fixture["status"], fixture["headers"], fixture["content"])
+
+    def close(self):
+        pass
+
+
+def transport_from_env():
+    """Transport factory `(pool_maxsize) -> adapter` configured by the environment, or None."""
+    mode = os.getenv("AVOCADO_HTTP_TRANSPORT", "").lower()
+    if not mode:
+        return None
+    fixtures_dir = os.getenv("AVOCADO_HTTP_FIXTURES", "fixtures")
+
+    if mode == "record":
+        log.info("Recording HTTP fixtures to %s", fixtures_dir)
+        return lambda pool_maxsize: RecordTransport(fixtures_dir, pool_connections=1, pool_maxsize=pool_maxsize)
+    if mode == "replay":
+        log.info("Replaying HTTP fixtures from %s", fixtures_dir)
+        error_status = os.getenv("AVOCADO_HTTP_ERROR_STATUS")
+        seed = os.getenv("AVOCADO_HTTP_SEED")
+        transport = ReplayTransport(
+            fixtures_dir,
+            latency=float(os.getenv("AVOCADO_HTTP_LATENCY", 0)),
+            error_rate=float(os.getenv("AVOCADO_HTTP_ERROR_RATE", 0)),
+            error_status=int(error_status) if error_status else None,
+            seed=int(seed) if seed else None,
+        )
+        return lambda pool_maxsize: transport
+    log.warning("Unknown AVOCADO_HTTP_TRANSPORT '%s', using the network", mode)
+    return None
@@ -1,25 +1,119 @@
 # core/manager.py
-import os, json, sys
-from core.db import save_games
-from core.steam import get_owned_games, resolve_username, get_game_info
-from core.rawg import get_game_cover
-from core.steam_manifest import get_installed_appids
-from core.db import load_games, save_games
+import os, json, sys, time, threading
+from core.steam_manifest import get_installed_appids, SCAN_DEADLINE
+from core.metrics import get_logger, begin_run, metrics, span
+from core.db import (save_games, get_game_details, save_game_details, load_game_states,
+                     update_play_stats, set_installed, delete_games)
+
+# core.steam / core.rawg / core.covers pull in requests, PIL and dotenv: they are
+# imported inside the functions that need them to keep startup light.
 
 CONFIG_DIR = os.path.join(os.getenv("APPDATA") or os.path.expanduser("~"), "Avocado Game Launcher")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "settings.json")
 
+# Aggregated spans/counters of the last import or refresh (see core.metrics)
+LAST_RUN_METRICS_FILE = os.path.join(CONFIG_DIR, "last_run_metrics.json")
+
+log = get_logger("STEAM")
+
+# Stored appdetails older than this are refreshed in the background (seconds)
+DETAILS_TTL = 3 * 24 * 3600
+
+# Settings
+class SettingsStore:
+    """
+    Process-wide settings cache. settings.json is read once and served from memory;
+    external edits are picked up by mtime (checked at most every MTIME_CHECK_INTERVAL
+    seconds). Writes go to a temp file + os.replace, and subscribers are called with
+    the dict of changed keys.
+    """
+    MTIME_CHECK_INTERVAL = 1.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: dict = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self._subscribers = []
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self):
+        """Reload from disk if the file changed since the last read."""
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < self.MTIME_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        mtime = self._file_mtime()
+        if mtime == self._mtime and mtime is not None:
+            return
+
+        data = {}
+        if mtime is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                get_logger("SETTINGS").warning("Could not read %s: %s", self.path, e)
+                data = self._data
+        self._mtime = mtime if mtime is not None else 0
+        self._apply(data)
+
+    def _apply(self, data: dict):
+        old, self._data = self._data, data
+        changed = {k: data.get(k) for k in old.keys() | data.keys() if old.get(k) != data.get(k)}
+        if changed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    get_logger("SETTINGS").error("Subscriber failed: %s", e)
+
+    def all(self) -> dict:
+        with self._lock:
+            self._refresh()
+            return dict(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._refresh()
+            return self._data.get(key, default)
+
+    def save(self, settings: dict):
+        """Replace all settings and write them atomically."""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(settings, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._mtime = self._file_mtime()
+            self._checked_at = time.monotonic()
+            self._apply(dict(settings))
+
+    def subscribe(self, callback):
+        """Call `callback(changed: dict)` on every change. Returns an unsubscribe function."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+settings_store = SettingsStore(CONFIG_FILE)
+
 # Load and save settings
 def load_settings():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    return settings_store.all()
 
 def save_settings(settings):
-    os.makedirs(CONFIG_DIR, exist_ok=True)
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=4)
+    settings_store.save(settings)
+
+def get_setting(key, default=None):
+    return settings_store.get(key, default)
 
 # Resource path for PyInstaller compatibility
 def resource_path(relative_path):
@@ -38,10 +132,29 @@ report_problem_icon_path = resource_path("assets/icons/report_problem.png")
 settings_icon_path = resource_path("assets/icons/settings.png")
 
 
+def _export_run_metrics():
+    try:
+        metrics.export_json(LAST_RUN_METRICS_FILE)
+    except OSError as e:
+        log.warning("Could not write run metrics: %s", e)
+
+
 def import_games_from_steam(username: str) -> list[dict]:
     """
     Import ONLY installed Steam games into the DB.
     """
+    begin_run("import")
+    with span("steam.import"):
+        formatted = _import_games(username)
+    _export_run_metrics()
+    return formatted
+
+
+def _import_games(username: str) -> list[dict]:
+    from core.steam import get_owned_games, resolve_username
+    from core.rawg import fetch_covers, DEFAULT_COVER_WORKERS
+    from core.covers import available_renditions
+
     settings = load_settings()
     steamid = settings.get("steamid")
 
@@ -54,12 +167,12 @@ def import_games_from_steam(username: str) -> list[dict]:
         settings["username"] = username
         save_settings(settings)
 
-    print(f"[STEAM] Resolving owned games for steamid: {steamid}")
+    log.info("Resolving owned games for steamid: %s", steamid)
     games = get_owned_games(steamid)
-    print(f"[STEAM] Owned games: {len(games)}")
+    log.info("Owned games: %d", len(games))
 
-    installed_ids = get_installed_appids()  # <-- checks all libraries
-    print(f"[STEAM] Installed appids: {len(installed_ids)}")
+    installed_ids = get_installed_appids(deadline=settings.get("scan_deadline", SCAN_DEADLINE))  # <-- checks all libraries
+    log.info("Installed appids: %d", len(installed_ids))
 
     formatted = []
     for g in games:
@@ -67,90 +180,148 @@ def import_games_from_steam(username: str) -> list[dict]:
         if appid not in installed_ids:  
             continue  # <-- skip if not installed
 
-        name = g.get("name", "Unknown")
-        playtime = g.get("playtime_forever", 0)
-
-        cover_path = get_game_cover(name, appid)  # returns local file or None
-
         formatted.append({
             "appid": appid,
-            "name": name,
-            "playtime": playtime,
-            "cover": cover_path,
+            "name": g.get("name", "Unknown"),
+            "playtime": g.get("playtime", 0),
+            "last_played": g.get("last_played", 0),
+            "cover": None,
             "installed": True,
         })
 
+    # Fetch all covers concurrently (local file or None)
+    covers, failures = fetch_covers(
+        [(g["name"], g["appid"]) for g in formatted],
+        max_workers=settings.get("cover_workers", DEFAULT_COVER_WORKERS),
+    )
+    for game, cover_path in zip(formatted, covers):
+        game["cover"] = cover_path
+        game["renditions"] = available_renditions(game["appid"]) if cover_path else []
+    if failures:
+        log.warning("Cover lookup failed for %d games", len(failures))
+
     # Save ONLY installed games to DB
     save_games(formatted)
-    print(f"[STEAM] Import complete. Saved {len(formatted)} installed games to DB.")
+    log.info("Import complete. Saved %d installed games to DB.", len(formatted))
 
     return formatted
 
 
 
-def quick_refresh(username: str) -> list[dict]:
-    """Lightweight refresh: only keep installed games in DB."""
+def quick_refresh(username: str) -> dict:
+    """
+    Sync the DB with Steam + the local manifests, writing only what changed.
+    Returns the diff for the UI:
+      added        new installed games (full rows, covers fetched)
+      removed      appids no longer owned nor installed (deleted)
+      updated      {appid: {"playtime": ..., "last_played": ...}}
+      installed    appids of stored games that are installed again
+      uninstalled  appids of stored games that are no longer installed
+    """
+    begin_run("refresh")
+    with span("steam.refresh"):
+        diff = _refresh_games(username)
+    _export_run_metrics()
+    return diff
+
+
+def _refresh_games(username: str) -> dict:
+    from core.steam import get_owned_games, resolve_username
+    from core.rawg import fetch_covers, DEFAULT_COVER_WORKERS
+    from core.covers import available_renditions
+
     settings = load_settings()
-    steamid = resolve_username(username)
+    steamid = settings.get("steamid")
     if not steamid:
-        raise ValueError("Could not resolve SteamID")
-
-    # Fetch current Steam library (basic info only)
-    new_games = get_owned_games(steamid)
-    installed_ids = get_installed_appids()
-
-    # Load old games from DB
-    old_games = load_games()
-    old_map = {g["appid"]: g for g in old_games}
-
-    changed = False
-    merged = []
-
-    for g in new_games:
-        appid = g["appid"]
-        if appid not in installed_ids:
-            continue  # <-- keep only installed
-
-        name = g.get("name", "Unknown")
-        playtime = g.get("playtime_forever", 0)
-
-        if appid in old_map:
-            # Existing game → keep old data, update playtime
-            old = old_map[appid]
-            if old.get("playtime") != playtime:
-                changed = True
-            merged.append({
-                **old,
-                "installed": True,
-                "playtime": playtime
-            })
-        else:
-            # New installed game → fetch cover
-            cover_path = get_game_cover(name, appid)
-            merged.append({
-                "appid": appid,
-                "name": name,
-                "cover": cover_path,
-                "installed": True,
-                "playtime": playtime
-            })
-            changed = True
-
-    # Save only if something has changed
-    if changed:
-        save_games(merged)
-
-    return merged
+        steamid = resolve_username(username)
+        if not steamid:
+            raise ValueError("Could not resolve SteamID")
+        settings["steamid"] = steamid
+        settings["username"] = username
+        save_settings(settings)
+
+    owned = {g["appid"]: g for g in get_owned_games(steamid)}
+    installed_ids = get_installed_appids(deadline=settings.get("scan_deadline", SCAN_DEADLINE))
+    stored = load_game_states()
+
+    added = []
+    updated = {}
+    installed, uninstalled = set(), set()
+
+    for appid, g in owned.items():
+        playtime = g.get("playtime", 0)
+        last_played = g.get("last_played", 0)
+
+        if appid not in stored:
+            if appid in installed_ids:  # <-- only installed games are imported
+                added.append({
+                    "appid": appid,
+                    "name": g.get("name", "Unknown"),
+                    "playtime": playtime,
+                    "last_played": last_played,
+                    "cover": None,
+                    "installed": True,
+                })
+            continue
+
+        old_playtime, old_last_played, _ = stored[appid]
+        if (old_playtime, old_last_played) != (playtime, last_played):
+            updated[appid] = {"playtime": playtime, "last_played": last_played}
+
+    for appid, (_, _, was_installed) in stored.items():
+        is_installed = appid in installed_ids
+        if is_installed != was_installed:
+            (installed if is_installed else uninstalled).add(appid)
+
+    # An empty library means a private profile or a failed request, not "owns nothing"
+    removed = set()
+    if owned:
+        removed = {appid for appid in stored if appid not in owned and appid not in installed_ids}
+        uninstalled -= removed
+
+    # Fetch covers for new games concurrently
+    if added:
+        covers, _ = fetch_covers(
+            [(g["name"], g["appid"]) for g in added],
+            max_workers=settings.get("cover_workers", DEFAULT_COVER_WORKERS),
+        )
+        for game, cover_path in zip(added, covers):
+            game["cover"] = cover_path
+            game["renditions"] = available_renditions(game["appid"]) if cover_path else []
+
+    # Write only the changed rows
+    if added:
+        save_games(added)
+    update_play_stats([(appid, c["playtime"], c["last_played"]) for appid, c in updated.items()])
+    set_installed(installed, True)
+    set_installed(uninstalled, False)
+    delete_games(removed)
+
+    log.info("Refresh: %d added, %d removed, %d updated, %d installed, %d uninstalled",
+             len(added), len(removed), len(updated), len(installed), len(uninstalled))
+
+    return {
+        "added": added,
+        "removed": removed,
+        "updated": updated,
+        "installed": installed,
+        "uninstalled": uninstalled,
+    }
 
 
 # Get game info Steam
-def fetch_game_info(appid: int) -> dict:
-    """Wrapper to safely fetch detailed game info from Steam API."""
+_details_refreshing: set[int] = set()
+_details_lock = threading.Lock()
+
+def _download_game_info(appid: int) -> dict:
+    """Fetch appdetails from Steam, normalize and store them. Returns {} on failure."""
+    from core.steam import get_game_info
+
     data = get_game_info(appid)
     if not data:
         return {}
-    
-    return {
+
+    details = {
         "name": data.get("name"),
         "description": data.get("short_description"),
         "header_image": data.get("header_image"),
@@ -158,4 +329,35 @@ def fetch_game_info(appid: int) -> dict:
         "developers": data.get("developers", []),
         "publishers": data.get("publishers", []),
         "release_date": data.get("release_date", {}).get("date"),
-    }
\ No newline at end of file
+    }
+    save_game_details(appid, details)
+    return details
+
+def _refresh_game_info(appid: int):
+    """Background revalidation of stored appdetails."""
+    try:
+        _download_game_info(appid)
+    except Exception as e:
+        log.warning("Background refresh failed for %s: %s", appid, e)
+    finally:
+        with _details_lock:
+            _details_refreshing.discard(appid)
+
+def fetch_game_info(appid: int) -> dict:
+    """
+    Get detailed game info, served from the local store when available.
+    Stored entries older than DETAILS_TTL are returned as-is and refreshed in the background.
+    """
+    cached = get_game_details(appid)
+    if cached is None:
+        return _download_game_info(appid)
+
+    ttl = load_settings().get("details_ttl", DETAILS_TTL)
+    if time.time() - cached["last_fetched"] > ttl:
+        with _details_lock:
+            start = appid not in _details_refreshing
+            _details_refreshing.add(appid)
+        if start:
+            threading.Thread(target=_refresh_game_info, args=(appid,), daemon=True).start()
+
+    return cached
@@ -0,0 +1,131 @@
+"""
+Lightweight instrumentation: leveled logging, timing spans and counters.
+
+    log = get_logger("MANIFEST")        # prints "[MANIFEST] ..." at INFO and above
+    with span("manifest.scan"):         # aggregated count / total / max time
+        ...
+    count("http.bytes", len(body))
+
+The log level comes from AVOCADO_LOG_LEVEL (default INFO; DEBUG shows per-item lines).
+Spans and counters are aggregated per run (see begin_run) and exported with snapshot().
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+LOGGER_ROOT = "avocado"
+
+
+# ---- Logging ----
+class _TagFormatter(logging.Formatter):
+    def format(self, record):
+        record.tag = record.name.rsplit(".", 1)[-1]
+        return super().format(record)
+
+
+def _configure_logging():
+    root = logging.getLogger(LOGGER_ROOT)
+    if root.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_TagFormatter("[%(tag)s] %(message)s"))
+    root.addHandler(handler)
+    root.propagate = False
+    set_log_level(os.getenv("AVOCADO_LOG_LEVEL", "INFO"))
+
+
+def set_log_level(level: str | int):
+    """Set the level for every launcher logger ("DEBUG", "INFO", "WARNING", ...)."""
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    logging.getLogger(LOGGER_ROOT).setLevel(level)
+
+
+def get_logger(tag: str) -> logging.Logger:
+    """Logger printing as "[TAG] message"."""
+    return logging.getLogger(f"{LOGGER_ROOT}.{tag}")
+
+
+_configure_logging()
+
+
+# ---- Spans and counters ----
+class Metrics:
+    """Thread-safe aggregate of timing spans and counters for the current run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, run: str | None = None):
+        with self._lock:
+            self.run = run
+            self.started_at = time.time()
+            self._spans: dict[str, list] = {}  # name -> [count, total, max]
+            self._counters: dict[str, int] = {}
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                self._spans[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        """Aggregated spans (ms) and counters as a JSON-ready dict."""
+        with self._lock:
+            spans = {
+                name: {
+                    "count": c,
+                    "total_ms": round(total * 1000, 3),
+                    "avg_ms": round(total / c * 1000, 3),
+                    "max_ms": round(peak * 1000, 3),
+                }
+                for name, (c, total, peak) in sorted(self._spans.items())
+            }
+            return {
+                "run": self.run,
+                "started_at": self.started_at,
+                "elapsed_s": round(time.time() - self.started_at, 3),
+                "spans": spans,
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def export_json(self, path) -> str:
+        """Write snapshot() to `path`. Returns the path."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return str(path)
+
+
+metrics = Metrics()
+span = metrics.span
+count = metrics.count
+
+
+def begin_run(name: str):
+    """Start a new aggregation run (e.g. one import or refresh)."""
+    metrics.reset(name)
@@ -1,18 +1,25 @@
 import os
-import requests
-from PIL import Image
-import io
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from core.db import COVERS_DIR, get_rawg_lookup, save_rawg_lookup
+from core import http_client
+from core.covers import encode_cover, available_renditions
+from core.metrics import get_logger, span, count
+
+log = get_logger("RAWG")
 
 # Load API key
 load_dotenv()
 RAWG_API_KEY = os.getenv("RAWG_API_KEY")
+RAWG_API_URL = os.getenv("RAWG_API_URL", "https://api.rawg.io/api")
+
+# Lookup cache lifetimes (seconds). Misses expire sooner so new RAWG entries get picked up.
+LOOKUP_TTL = int(os.getenv("RAWG_LOOKUP_TTL", 30 * 24 * 3600))
+NEGATIVE_TTL = int(os.getenv("RAWG_NEGATIVE_TTL", 7 * 24 * 3600))
 
-# Base folder in Roaming
-APPDATA_DIR = Path(os.getenv("APPDATA")) / "Avocado Game Launcher" / "data"
-COVERS_DIR = APPDATA_DIR / "covers"
-COVERS_DIR.mkdir(parents=True, exist_ok=True)
+# Worker count for bulk cover fetching
+DEFAULT_COVER_WORKERS = 8
 
 
 def get_game_cover(game_name: str, appid: int) -> str | None:
@@ -20,61 +27,121 @@ def get_game_cover(game_name: str, appid: int) -> str | None:
     Search RAWG API for a game cover image by its name.
     Downloads it and saves as WEBP locally.
     Returns the file path or None if not found.
+    Lookups (including misses) are cached per appid, so cached covers cost no request.
     """
-    url = "https://api.rawg.io/api/games"
+    # Check if already cached
+    cover_file = COVERS_DIR / f"{appid}.webp"
+    if cover_file.exists():
+        count("cover.local")
+        if not available_renditions(appid):
+            # Covers saved before renditions existed: add the thumbnails, keep the file as is
+            save_image_as_webp(cover_file.read_bytes(), appid, save_cover=False)
+        return str(cover_file)
+
+    cover_url = None
+    lookup = get_rawg_lookup(appid)
+    if lookup:
+        age = time.time() - lookup["fetched_at"]
+        if lookup["image_url"] is None and age < NEGATIVE_TTL:
+            count("rawg.lookup.hit")
+            return None
+        if lookup["image_url"] and age < LOOKUP_TTL:
+            count("rawg.lookup.hit")
+            cover_url = lookup["image_url"]
+
+    if not cover_url:
+        count("rawg.lookup.miss")
+        cover_url = _search_cover_url(game_name, appid)
+        if not cover_url:
+            return None
+
+    try:
+        # Download the cover image
+        resp = http_client.get(cover_url)
+        if resp.status_code == 200:
+            return save_image_as_webp(resp.content, appid)
+        else:
+            log.error("Failed to download cover for %s, status %s", game_name, resp.status_code)
+    except Exception as e:
+        log.error("Exception downloading cover for %s: %s", game_name, e)
+
+    return None
+
+
+def _search_cover_url(game_name: str, appid: int) -> str | None:
+    """Search RAWG for a game and cache the result. Returns the background_image URL."""
+    url = f"{RAWG_API_URL}/games"
     params = {
         "key": RAWG_API_KEY,
         "search": game_name,
         "page_size": 1
     }
 
-    print(f"[INFO] Searching RAWG for cover: {game_name}")
-    response = requests.get(url, params=params, timeout=10)
-
-    # Check if already cached
-    cover_file = COVERS_DIR / f"{appid}.webp"
-    if cover_file.exists():
-        return str(cover_file)
+    log.debug("Searching RAWG for cover: %s", game_name)
+    response = http_client.get(url, params=params, cache=True)
 
+    # Request errors are not cached, only real "no result" answers
     if response.status_code != 200:
-        print(f"[ERROR] RAWG request failed: {response.status_code}")
+        log.error("RAWG request failed: %s", response.status_code)
         return None
 
     data = response.json()
     results = data.get("results", [])
     if not results:
-        print(f"[WARNING] No results found in RAWG for {game_name}")
+        log.warning("No results found in RAWG for %s", game_name)
+        save_rawg_lookup(appid, None, None)
         return None
 
     cover_url = results[0].get("background_image")
     if not cover_url:
-        print(f"[WARNING] No cover URL found in RAWG for {game_name}")
+        log.warning("No cover URL found in RAWG for %s", game_name)
+        save_rawg_lookup(appid, None, None)
         return None
 
-    try:
-        # Download the cover image
-        resp = requests.get(cover_url, timeout=10)
-        if resp.status_code == 200:
-            return save_image_as_webp(resp.content, appid)
-        else:
-            print(f"[ERROR] Failed to download cover for {game_name}, status {resp.status_code}")
-    except Exception as e:
-        print(f"[ERROR] Exception downloading cover for {game_name}: {e}")
+    save_rawg_lookup(appid, results[0].get("id"), cover_url)
+    return cover_url
 
-    return None
+
+@span("covers.fetch")
+def fetch_covers(games: list[tuple[str, int]], max_workers: int = DEFAULT_COVER_WORKERS) -> tuple[list[str | None], dict[int, str]]:
+    """
+    Fetch covers for many games concurrently.
+    `games` is a list of (name, appid) pairs.
+    Returns the cover paths (None when not found) in the same order as `games`,
+    plus a dict appid -> error for lookups that raised. One failure never aborts the batch.
+    """
+    covers: list[str | None] = [None] * len(games)
+    failures: dict[int, str] = {}
+    if not games:
+        return covers, failures
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            pool.submit(get_game_cover, name, appid): i
+            for i, (name, appid) in enumerate(games)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                covers[i] = future.result()
+            except Exception as e:
+                appid = games[i][1]
+                failures[appid] = str(e)
+                log.error("Cover fetch failed for %s (%s): %s", games[i][0], appid, e)
+
+    return covers, failures
 
 
-def save_image_as_webp(content: bytes, appid: int) -> str:
+def save_image_as_webp(content: bytes, appid: int, save_cover: bool = True) -> str:
     """
-    Convert downloaded image bytes into WEBP and save locally.
-    Returns the local file path.
+    Convert downloaded image bytes into WEBP (full resolution) plus thumbnail renditions
+    and save locally. Encoding runs in a process pool (see core.covers). Returns the local cover path.
     """
     try:
-        img = Image.open(io.BytesIO(content))
-        file_path = COVERS_DIR / f"{appid}.webp"
-        img.save(file_path, "WEBP", quality=80, optimize=True)
-        print(f"[INFO] Optimized cover saved: {file_path}")
-        return str(file_path)
+        with span("cover.encode"):
+            file_path, sizes = encode_cover(content, appid, save_cover)
+        log.debug("Optimized cover saved: %s (renditions: %s)", file_path, sizes)
+        return file_path
     except Exception as e:
-        print(f"[ERROR] Failed to convert image for {appid}: {e}")
+        log.error("Failed to convert image for %s: %s", appid, e)
         return None
@@ -0,0 +1,41 @@
+"""
+Startup timing, enabled with `python main.py --startup-profile`.
+main.py marks each phase; report() prints the timings and which heavy modules
+were already imported (they should only load when an import/refresh needs them).
+"""
+import sys
+import time
+
+_START = time.perf_counter()
+
+enabled = "--startup-profile" in sys.argv
+
+# Time from process start to a usable window (ms)
+STARTUP_BUDGET_MS = 1500
+
+# Modules that must not be imported before the window is shown
+HEAVY_MODULES = ("requests", "PIL", "dotenv", "core.steam", "core.rawg", "core.covers", "core.http_client")
+
+_marks: list[tuple[str, float]] = []
+
+
+def mark(label: str):
+    """Record the end of a startup phase."""
+    if enabled:
+        _marks.append((label, time.perf_counter()))
+
+
+def report() -> bool:
+    """Print phase timings. Returns False if the budget was exceeded or a heavy module was loaded."""
+    previous = _START
+    print("[STARTUP] Phase                          ms")
+    for label, at in _marks:
+        print(f"[STARTUP] {label:<28} {(at - previous) * 1000:8.1f}")
+        previous = at
+    total_ms = (previous - _START) * 1000
+    print(f"[STARTUP] {'total':<28} {total_ms:8.1f}  (budget {STARTUP_BUDGET_MS} ms)")
+
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    if loaded:
+        print(f"[STARTUP] Heavy modules loaded at startup: {', '.join(loaded)}")
+    return total_ms <= STARTUP_BUDGET_MS and not loaded
@@ -1,13 +1,20 @@
 import os
 import requests
+from core import http_client
 from dotenv import load_dotenv
-import vdf
+from pathlib import Path
+from core.steam_manifest import _parse_libraryfolders, read_manifest
+from core.metrics import get_logger
+
+log = get_logger("STEAM")
 
 # Load API KEY from .env
 load_dotenv()
 STEAM_API_KEY = os.getenv("STEAM_API_KEY")
 
-BASE_URL = "http://api.steampowered.com"
+# Endpoints (overridable, e.g. to point at the benchmark stand-in)
+BASE_URL = os.getenv("STEAM_API_URL", "https://api.steampowered.com")
+STORE_URL = os.getenv("STEAM_STORE_URL", "https://store.steampowered.com")
 
 
 def resolve_username(username: str) -> str | None:
@@ -20,7 +27,7 @@ def resolve_username(username: str) -> str | None:
         "key": STEAM_API_KEY,
         "vanityurl": username
     }
-    resp = requests.get(url, params=params)
+    resp = http_client.get(url, params=params, cache=True)
     resp.raise_for_status()
     data = resp.json()
     if data.get("response", {}).get("success") == 1:
@@ -42,7 +49,7 @@ def get_owned_games(steamid: str) -> list[dict]:
         "include_played_free_games": 1,
     }
 
-    resp = requests.get(url, params=params)
+    resp = http_client.get(url, params=params, cache=True)
     resp.raise_for_status()
     raw_games = resp.json().get("response", {}).get("games", [])
 
@@ -52,11 +59,12 @@ def get_owned_games(steamid: str) -> list[dict]:
             "appid": g["appid"],
             "name": g["name"],
             "playtime": g.get("playtime_forever", 0),
+            "last_played": g.get("rtime_last_played", 0),
             # Official Steam cover (always header.jpg)
             "cover": f"https://cdn.cloudflare.steamstatic.com/steam/apps/{g['appid']}/header.jpg"
         })
 
-    print(f"[DEBUG] Found {len(games)} games in Steam library")
+    log.debug("Found %d games in Steam library", len(games))
     
     return games
 
@@ -66,13 +74,13 @@ def get_game_info(app_id):
     if not STEAM_API_KEY:
         return None
         
-    url = f"http://store.steampowered.com/api/appdetails?appids={app_id}"
+    url = f"{STORE_URL}/api/appdetails"
     try:
-        resp = requests.get(url, timeout=5).json()
+        resp = http_client.get(url, params={"appids": app_id}, cache=True).json()
         if resp and str(app_id) in resp and resp[str(app_id)]['success']:
             return resp[str(app_id)]['data']
     except requests.RequestException as e:
-        print(f"Error en la petición a la API de Steam: {e}")
+        log.error("Steam API request failed: %s", e)
         return None
     return None
 
@@ -80,21 +88,21 @@ def get_game_info(app_id):
 def get_installed_games(steam_path):
     """Get games install"""
     installed = []
-    library_folders = vdf.load(open(os.path.join(steam_path, "steamapps", "libraryfolders.vdf")))["libraryfolders"]
+    library_folders = _parse_libraryfolders(Path(steam_path) / "steamapps" / "libraryfolders.vdf")
 
-    for lib_id, lib_data in library_folders.items():
-        path = lib_data["path"]
-        steamapps = os.path.join(path, "steamapps")
+    for path in library_folders:
+        steamapps = path / "steamapps"
+        if not steamapps.is_dir():
+            continue
 
         for file in os.listdir(steamapps):
             if file.startswith("appmanifest") and file.endswith(".acf"):
-                manifest_path = os.path.join(steamapps, file)
-                manifest = vdf.load(open(manifest_path, encoding="utf-8"))
-                appid = manifest["AppState"]["appid"]
-                installdir = manifest["AppState"]["installdir"]
+                manifest = read_manifest(steamapps / file)
+                if "appid" not in manifest:
+                    continue
                 installed.append({
-                    "appid": appid,
-                    "name": manifest["AppState"]["name"],
-                    "path": os.path.join(path, "steamapps", "common", installdir)
+                    "appid": manifest["appid"],
+                    "name": manifest.get("name", "Unknown"),
+                    "path": str(steamapps / "common" / manifest.get("installdir", ""))
                 })
-    return installed
\ No newline at end of file
+    return installed
@@ -1,86 +1,368 @@
 import os
 import re
+import threading
+import time
 from pathlib import Path
+from core.db import load_manifest_index, save_manifest_index
+from core.metrics import get_logger, span, count, metrics
+
+log = get_logger("MANIFEST")
 
 def _default_steam_root() -> Path:
-    """Return a best-guess Steam root on Windows."""
+    """Return a best-guess Steam root on Windows (STEAM_PATH overrides it)."""
     # You can improve this reading registry if you want. This covers the common path.
-    return Path(r"C:\Program Files (x86)\Steam")
+    return Path(os.getenv("STEAM_PATH") or r"C:\Program Files (x86)\Steam")
+
+# Max seconds to wait for a library before using its last known state
+SCAN_DEADLINE = 10.0
+
+# ---- Text VDF / ACF parsing ----
+
+# One token per match: a quoted string, a brace, or a // comment (skipped)
+_TOKEN_RE = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|([{}])|(//[^\n]*)')
+_ESCAPE_RE = re.compile(r'\\(.)')
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+# ACF field -> (output key, converter). Matched case-insensitively (old manifests use "appID").
+MANIFEST_FIELDS = {
+    "appid": ("appid", int),
+    "name": ("name", str),
+    "installdir": ("installdir", str),
+    "sizeondisk": ("size_on_disk", int),
+    "buildid": ("buildid", int),
+    "lastupdated": ("last_updated", int),
+    "stateflags": ("state_flags", int),
+}
+
+
+# Brace tokens (sentinels, so a quoted "{" stays a plain string)
+_OPEN = object()
+_CLOSE = object()
+
+
+def _unescape(value: str) -> str:
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+def _tokenize(text: str):
+    """Yield VDF tokens in order: strings, or the _OPEN/_CLOSE brace sentinels."""
+    if "\\" not in text and "//" not in text:
+        # Fast path (almost every file): no escapes or comments, so splitting on quotes
+        # alternates between the gaps holding braces and the string tokens.
+        parts = text.split('"')
+        for i in range(1, len(parts), 2):
+            gap = parts[i - 1]
+            if "{" in gap or "}" in gap:
+                for ch in gap:
+                    if ch == "{":
+                        yield _OPEN
+                    elif ch == "}":
+                        yield _CLOSE
+            yield parts[i]
+        return
+
+    for string, brace, comment in _TOKEN_RE.findall(text):
+        if comment:
+            continue
+        if brace:
+            yield _OPEN if brace == "{" else _CLOSE
+        else:
+            yield _unescape(string) if "\\" in string else string
+
+def parse_vdf(text: str) -> dict:
+    """
+    Parse Valve text KeyValues (libraryfolders.vdf, appmanifest_*.acf) in a single pass.
+    Returns nested dicts of strings. Malformed input never raises; unbalanced blocks are closed.
+    """
+    root: dict = {}
+    stack = [root]
+    key = None
+
+    for token in _tokenize(text):
+        if token is _OPEN:
+            child: dict = {}
+            if key is not None:
+                stack[-1][key] = child
+            stack.append(child)
+            key = None
+        elif token is _CLOSE:
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = token
+        else:
+            stack[-1][key] = token
+            key = None
+
+    return root
+
+def parse_manifest(text: str) -> dict:
+    """
+    Extract appid, name, installdir, size_on_disk, buildid, last_updated and state_flags
+    from an appmanifest's text. Missing or invalid fields are left out.
+    Only top-level AppState values are read, and tokenizing stops once all are found.
+    """
+    fields = {}
+    depth = 0
+    key = None
+
+    for token in _tokenize(text):
+        if token is _OPEN:
+            depth += 1
+            key = None
+        elif token is _CLOSE:
+            depth -= 1
+            key = None
+        elif key is None:
+            key = token
+        else:
+            spec = MANIFEST_FIELDS.get(key.lower()) if depth == 1 else None
+            key = None
+            if spec is None:
+                continue
+            out_key, convert = spec
+            try:
+                fields[out_key] = convert(token)
+            except ValueError:
+                continue
+            if len(fields) == len(MANIFEST_FIELDS):
+                break
+
+    return fields
+
+def read_manifest(acf_path: Path) -> dict:
+    """Read and parse an appmanifest_*.acf. Returns {} if unreadable."""
+    try:
+        with open(acf_path, "r", encoding="utf-8", errors="ignore") as f:
+            return parse_manifest(f.read())
+    except OSError:
+        return {}
 
 def _parse_libraryfolders(vdf_path: Path) -> list[Path]:
     """
     Parse libraryfolders.vdf and return all library paths as Path objects.
     Supports the modern VDF where entries are:
-      "0" { "path" "X:\SteamLibrary" ... }
+      "0" { "path" "X:\\SteamLibrary" "apps" { ... } ... }
+    and the legacy format where entries are plain strings: "1" "X:\\SteamLibrary"
     """
     libs = []
     if not vdf_path.exists():
         return libs
 
-    text = vdf_path.read_text(encoding="utf-8", errors="ignore")
-    # Find blocks like: "123" { "path" "X:\\SteamLibrary" ... }
-    # We’ll capture the path lines.
-    for match in re.finditer(r'"\d+"\s*\{[^}]*?"path"\s*"([^"]+)"', text, re.IGNORECASE | re.DOTALL):
-        raw = match.group(1)
-        try:
+    try:
+        with open(vdf_path, "r", encoding="utf-8", errors="ignore") as f:
+            parsed = parse_vdf(f.read())
+    except OSError:
+        return libs
+
+    folders = next((v for k, v in parsed.items() if k.lower() == "libraryfolders" and isinstance(v, dict)), {})
+    for key, entry in folders.items():
+        if not key.isdigit():
+            continue
+        if isinstance(entry, dict):
+            raw = next((v for k, v in entry.items() if k.lower() == "path"), None)
+        else:
+            raw = entry
+        if raw:
             libs.append(Path(raw))
-        except Exception:
-            pass
     return libs
 
-def get_installed_appids(steam_root: Path | None = None) -> set[int]:
+def _library_paths(steam_root: Path) -> list[Path]:
+    """Main Steam root plus the extra libraries from libraryfolders.vdf (deduplicated)."""
+    libraries: list[Path] = [steam_root]  # include main Steam root
+    vdf = steam_root / "steamapps" / "libraryfolders.vdf"
+    libraries += _parse_libraryfolders(vdf)
+
+    unique, keys = [], set()
+    for lib in libraries:
+        key = os.path.normcase(os.path.normpath(str(lib)))
+        if key not in keys:
+            keys.add(key)
+            unique.append(lib)
+    return unique
+
+def get_steamapps_dirs(steam_root: Path | None = None) -> list[Path]:
+    """Return the steamapps folder of every Steam library."""
+    if steam_root is None:
+        steam_root = _default_steam_root()
+    return [lib / "steamapps" for lib in _library_paths(steam_root)]
+
+def _scan_library(lib: Path, index: dict[str, dict]) -> dict:
+    """
+    Scan one library's steamapps folder with os.scandir.
+    Returns installed appids, manifest paths seen, index updates and timing.
+    """
+    start = time.perf_counter()
+    steamapps = lib / "steamapps"
+    result = {"path": str(lib), "status": "ok", "installed": set(), "names": {}, "seen": set(), "updates": {}}
+
+    try:
+        with os.scandir(steamapps) as it:
+            manifests = [e for e in it if e.name.startswith("appmanifest_") and e.name.endswith(".acf")]
+    except FileNotFoundError:
+        result["status"] = "missing"
+        manifests = []
+    except OSError as e:
+        result["status"] = f"error: {e}"
+        manifests = []
+
+    # One listing of /common instead of a stat per game
+    common_dirs: set[str] = set()
+    if manifests:
+        try:
+            with os.scandir(steamapps / "common") as it:
+                common_dirs = {os.path.normcase(e.name) for e in it if e.is_dir()}
+        except OSError:
+            pass
+
+    for dir_entry in manifests:
+        try:
+            st = dir_entry.stat()
+        except OSError:
+            continue
+
+        key = dir_entry.path
+        result["seen"].add(key)
+        entry = index.get(key)
+        changed = entry is None or entry["mtime"] != st.st_mtime or entry["size"] != st.st_size
+        if changed:
+            entry = {"mtime": st.st_mtime, "size": st.st_size, "installed": False,
+                     **read_manifest(Path(key))}
+
+        appid = entry.get("appid")
+        if appid is None:
+            if changed:
+                result["updates"][key] = entry
+            continue
+
+        # Confirm the folder exists in /common to avoid stale manifests.
+        # Fallback: if installdir missing, treat presence of manifest as installed
+        # (very rare, but keep it conservative)
+        installdir = entry.get("installdir")
+        is_installed = os.path.normcase(installdir) in common_dirs if installdir else True
+
+        if is_installed:
+            result["installed"].add(appid)
+            result["names"][appid] = entry.get("name")
+        if changed:
+            log.debug("%s: %s -> %s", "Installed" if is_installed else "Skipped (folder missing)", appid, installdir)
+        if changed or is_installed != entry["installed"]:
+            result["updates"][key] = {**entry, "installed": is_installed}
+
+    result["manifests"] = len(manifests)
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+# Library scans still running past their deadline (normcased path -> thread).
+# A stuck drive gets no second scan until the first one returns.
+_running: dict[str, threading.Thread] = {}
+_running_lock = threading.Lock()
+
+def _start_library_scan(lib: Path, index: dict) -> dict | None:
     """
-    Return a set of installed appids by scanning ALL Steam libraries.
-    We verify installation by checking that the 'installdir' folder exists under 'common'.
+    Scan one library in a daemon thread, so a hung drive never blocks app exit.
+    Returns the job ({"thread", "result", "error"}), or None while an earlier scan
+    of the same library is still stuck.
+    """
+    key = os.path.normcase(str(lib))
+    job = {"thread": None, "result": None, "error": None}
+
+    def run():
+        try:
+            job["result"] = _scan_library(lib, index)
+        except Exception as e:
+            job["error"] = e
+        finally:
+            with _running_lock:
+                if _running.get(key) is job["thread"]:
+                    del _running[key]
+
+    with _running_lock:
+        if key in _running:
+            return None
+        job["thread"] = _running[key] = threading.Thread(target=run, name=f"manifest-scan {lib}", daemon=True)
+    job["thread"].start()
+    return job
+
+@span("manifest.scan")
+def scan_installed(steam_root: Path | None = None, deadline: float = SCAN_DEADLINE) -> dict:
+    """
+    Scan ALL Steam libraries for installed games, one worker per library, using the
+    persisted manifest index. Only new or changed manifests (by mtime and size) are
+    re-parsed; deleted ones are dropped.
+    Libraries that don't finish within `deadline` seconds (e.g. a sleeping or unplugged
+    drive) keep their previously indexed state instead of stalling the scan.
+    Returns {"installed": set, "added": set, "removed": set, "names": dict, "libraries": list}
+    where added/removed are relative to the previous scan, names maps installed appids to
+    their manifest name and libraries holds per-library timing.
     """
     if steam_root is None:
         steam_root = _default_steam_root()
 
-    libraries: list[Path] = [steam_root]  # include main Steam root
-    # Read extra libraries from libraryfolders.vdf
-    vdf = steam_root / "steamapps" / "libraryfolders.vdf"
-    libraries += _parse_libraryfolders(vdf)
+    index = load_manifest_index()
+    previous = {e["appid"] for e in index.values() if e["installed"]}
+    libraries = _library_paths(steam_root)
+
+    jobs = {lib: _start_library_scan(lib, index) for lib in libraries}
+    end = time.monotonic() + deadline
+    for job in jobs.values():
+        if job is not None:
+            job["thread"].join(max(0.0, end - time.monotonic()))
 
     installed: set[int] = set()
+    names: dict[int, str | None] = {}
+    seen: set[str] = set()
+    updates: dict[str, dict] = {}
+    report = []
 
-    for lib in libraries:
-        steamapps = lib / "steamapps"
-        common = steamapps / "common"
-        if not steamapps.exists():
+    for lib, job in jobs.items():
+        if job is None or job["thread"].is_alive() or job["error"] is not None:
+            # Keep what we knew about this library
+            if job is None:
+                status = "busy (previous scan still running)"
+            elif job["thread"].is_alive():
+                status = "timeout"
+            else:
+                status = f"error: {job['error']}"
+            steamapps = os.path.normcase(str(lib / "steamapps"))
+            for path, entry in index.items():
+                if os.path.normcase(os.path.dirname(path)) == steamapps:
+                    seen.add(path)
+                    if entry["installed"]:
+                        installed.add(entry["appid"])
+                        names[entry["appid"]] = entry.get("name")
+            report.append({"path": str(lib), "status": status, "elapsed": None, "manifests": None})
             continue
 
-        for fname in os.listdir(steamapps):
-            if not fname.startswith("appmanifest_") or not fname.endswith(".acf"):
-                continue
+        result = job["result"]
+        installed |= result["installed"]
+        names.update(result["names"])
+        seen |= result["seen"]
+        updates.update(result["updates"])
+        report.append({key: result[key] for key in ("path", "status", "elapsed", "manifests")})
 
-            acf_path = steamapps / fname
-            try:
-                data = acf_path.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-
-            appid_match = re.search(r'"appid"\s*"(\d+)"', data)
-            installdir_match = re.search(r'"installdir"\s*"([^"]+)"', data)
+    for lib in report:
+        if lib["elapsed"] is not None:
+            metrics.record("manifest.library", lib["elapsed"])
+        elapsed = f"{lib['elapsed'] * 1000:.0f} ms" if lib["elapsed"] is not None else "-"
+        log.debug("Library %s: %s, %s manifests, %s", lib["path"], lib["status"], lib["manifests"], elapsed)
+    count("manifest.reparsed", len(updates))
 
-            if not appid_match:
-                continue
+    removed_paths = set(index) - seen
+    if updates or removed_paths:
+        save_manifest_index(updates, removed_paths)
 
-            appid = int(appid_match.group(1))
-            installdir = installdir_match.group(1) if installdir_match else None
-
-            # Confirm the folder exists in /common to avoid stale manifests
-            if installdir:
-                install_path = common / installdir
-                if install_path.is_dir():
-                    installed.add(appid)
-                    print(f"[MANIFEST] Installed: {appid} @ {install_path}")
-                else:
-                    print(f"[MANIFEST] Skipped (folder missing): {appid} -> {install_path}")
-            else:
-                # Fallback: if installdir missing, treat presence of manifest as installed
-                # (very rare, but keep it conservative)
-                installed.add(appid)
-                print(f"[MANIFEST] Installed (no installdir field): {appid}")
+    result = {
+        "installed": installed,
+        "added": installed - previous,
+        "removed": previous - installed,
+        "names": names,
+        "libraries": report,
+    }
+    log.info("Total installed detected: %d (+%d / -%d, %d manifests re-indexed)",
+             len(installed), len(result["added"]), len(result["removed"]), len(updates))
+    return result
 
-    print(f"[MANIFEST] Total installed detected: {len(installed)}")
-    return installed
+def get_installed_appids(steam_root: Path | None = None, deadline: float = SCAN_DEADLINE) -> set[int]:
+    """Return a set of installed appids by scanning ALL Steam libraries."""
+    return scan_installed(steam_root, deadline)["installed"]
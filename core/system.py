@@ -0,0 +1,36 @@
+import ctypes
+import sys
+
+
+def running_steam_appid() -> int:
+    """AppID of the game Steam is running right now (0 if none or unknown)."""
+    if sys.platform != "win32":
+        return 0
+    import winreg
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam") as key:
+            value, _ = winreg.QueryValueEx(key, "RunningAppID")
+        return int(value)
+    except (OSError, ValueError):
+        return 0
+
+
+class _SystemPowerStatus(ctypes.Structure):
+    _fields_ = [
+        ("ACLineStatus", ctypes.c_ubyte),
+        ("BatteryFlag", ctypes.c_ubyte),
+        ("BatteryLifePercent", ctypes.c_ubyte),
+        ("SystemStatusFlag", ctypes.c_ubyte),
+        ("BatteryLifeTime", ctypes.c_ulong),
+        ("BatteryFullLifeTime", ctypes.c_ulong),
+    ]
+
+
+def on_battery() -> bool:
+    """True when the machine runs on battery (False if unknown)."""
+    if sys.platform != "win32":
+        return False
+    status = _SystemPowerStatus()
+    if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+        return False
+    return status.ACLineStatus == 0  # 0 = offline, 1 = online, 255 = unknown
@@ -1,4 +1,3 @@
-import requests
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QMessageBox
@@ -38,9 +37,12 @@ class AboutDialog(QDialog):
         layout.addWidget(self.contact_label)
 
     def check_update(self):
+        import requests
+        from core import http_client
+
         try:
             url = "https://api.github.com/repos/tecomoavocados-dev/avocado-game-launcher/releases/latest"
-            response = requests.get(url, timeout=5)
+            response = http_client.get(url, timeout=5, retries=1, cache=True)
             response.raise_for_status()
             latest = response.json().get("tag_name", "").replace("v", "")
 
@@ -0,0 +1,111 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
+)
+from core.i18n import t
+from ui.language_events import on_language_changed
+from core.manager import resource_path
+from core.metrics import metrics
+from ui.image_cache import header_cache_stats
+
+REFRESH_MS = 1000
+SPAN_COLUMNS = ("name", "count", "total_ms", "avg_ms", "max_ms")
+
+
+class DebugPanel(QDialog):
+    """Live view of the current run's spans and counters (see core.metrics), with JSON export."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowIcon(QIcon(resource_path("assets/icon.ico")))
+        self.resize(640, 520)
+
+        layout = QVBoxLayout(self)
+        self.run_label = QLabel()
+        layout.addWidget(self.run_label)
+
+        self.spans_label = QLabel()
+        layout.addWidget(self.spans_label)
+        self.spans_table = self._table(len(SPAN_COLUMNS))
+        layout.addWidget(self.spans_table, 2)
+
+        self.counters_label = QLabel()
+        layout.addWidget(self.counters_label)
+        self.counters_table = self._table(2)
+        layout.addWidget(self.counters_table, 1)
+
+        buttons = QHBoxLayout()
+        self.reset_btn = QPushButton()
+        self.reset_btn.clicked.connect(self.reset)
+        self.export_btn = QPushButton()
+        self.export_btn.clicked.connect(self.export)
+        buttons.addStretch()
+        buttons.addWidget(self.reset_btn)
+        buttons.addWidget(self.export_btn)
+        layout.addLayout(buttons)
+
+        # Refresh only while the panel is open
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+        self.retranslate_ui()
+        unsubscribe_language = on_language_changed(lambda lang: self.retranslate_ui())
+        self.destroyed.connect(lambda: unsubscribe_language())
+
+    @staticmethod
+    def _table(columns: int) -> QTableWidget:
+        table = QTableWidget(0, columns)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return table
+
+    def retranslate_ui(self):
+        self.setWindowTitle(t("debug.title"))
+        self.spans_label.setText(t("debug.spans"))
+        self.counters_label.setText(t("debug.counters"))
+        self.reset_btn.setText(t("debug.reset"))
+        self.export_btn.setText(t("debug.export"))
+        self.spans_table.setHorizontalHeaderLabels(list(SPAN_COLUMNS))
+        self.counters_table.setHorizontalHeaderLabels(["name", "value"])
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        self.run_label.setText(f"{t('debug.run')}: {snapshot['run'] or '-'} ({snapshot['elapsed_s']:.1f} s)")
+
+        # Slowest first
+        spans = sorted(snapshot["spans"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        self.spans_table.setRowCount(len(spans))
+        for row, (name, stats) in enumerate(spans):
+            self.spans_table.setItem(row, 0, QTableWidgetItem(name))
+            for column, key in enumerate(SPAN_COLUMNS[1:], start=1):
+                self.spans_table.setItem(row, column, QTableWidgetItem(f"{stats[key]:g}"))
+
+        counters = dict(snapshot["counters"])
+        counters.update({f"header_cache.{key}": value for key, value in header_cache_stats().items()})
+        self.counters_table.setRowCount(len(counters))
+        for row, (name, value) in enumerate(sorted(counters.items())):
+            self.counters_table.setItem(row, 0, QTableWidgetItem(name))
+            self.counters_table.setItem(row, 1, QTableWidgetItem(str(value)))
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, t("debug.export"), "metrics.json", "JSON (*.json)")
+        if path:
+            metrics.export_json(path)
@@ -0,0 +1,163 @@
+import bisect
+import string
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QBrush
+from core.db import rendition_path
+from ui.thumbnails import ThumbnailLoader, THUMBNAIL_SIZE
+
+# SQLite's lower() only folds ASCII; match query_games(order_by="name") exactly
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def name_key(game: dict) -> str:
+    """Sort key of the list's name order (ORDER BY lower(name))."""
+    return (game["name"] or "").translate(_ASCII_LOWER)
+
+
+# Role holding the full game dict
+GAME_ROLE = Qt.ItemDataRole.UserRole + 1
+ICON_SIZE = THUMBNAIL_SIZE
+
+
+class GamesModel(QAbstractListModel):
+    """
+    List model over the game store. Updates are applied as row-level
+    inserts/removals/changes, so views keep their selection and scroll position.
+    Cover icons are decoded in the background, only for rows the view actually paints.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._games: list[dict] = []
+        self._rows: dict[int, int] = {}  # appid -> row
+        self.thumbnails = ThumbnailLoader(self)
+        self.thumbnails.loaded.connect(self._on_thumbnail)
+
+    # ---- Qt model API ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._games)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        game = self._games[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return game["name"]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.thumbnails.icon(game["appid"], self._thumbnail_source(game))
+        if role == Qt.ItemDataRole.ForegroundRole and not game.get("installed", True):
+            return QBrush(Qt.GlobalColor.gray)  # No longer installed
+        if role == GAME_ROLE:
+            return game
+        return None
+
+    @staticmethod
+    def _thumbnail_source(game: dict) -> str | None:
+        """Pre-scaled rendition when the import generated one, else the cover itself."""
+        if ICON_SIZE in game.get("renditions", []):
+            return rendition_path(game["appid"], ICON_SIZE)
+        return game.get("cover")
+
+    def _on_thumbnail(self, appid: int):
+        row = self._rows.get(appid)
+        if row is not None:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    # ---- Store API ----
+    def game(self, appid: int) -> dict | None:
+        row = self._rows.get(appid)
+        return self._games[row] if row is not None else None
+
+    def index_of(self, appid: int) -> QModelIndex:
+        row = self._rows.get(appid)
+        return self.index(row, 0) if row is not None else QModelIndex()
+
+    def _reindex(self):
+        self._rows = {g["appid"]: i for i, g in enumerate(self._games)}
+
+    def set_games(self, games: list[dict]):
+        """Apply a new game list as a diff against the current one."""
+        new_ids = [g["appid"] for g in games]
+        new_set = set(new_ids)
+
+        # Removals, bottom-up so row numbers stay valid
+        for row in reversed(range(len(self._games))):
+            if self._games[row]["appid"] not in new_set:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._games[row]
+                self.endRemoveRows()
+        self._reindex()
+
+        # Surviving rows must keep their relative order; otherwise reset (rare: renames)
+        survivors = [appid for appid in new_ids if appid in self._rows]
+        if survivors != [g["appid"] for g in self._games]:
+            self.beginResetModel()
+            self._games = [dict(g) for g in games]
+            self._reindex()
+            self.endResetModel()
+            return
+
+        # Changes and inserts in new-list order
+        for row, game in enumerate(games):
+            current = self._games[row] if row < len(self._games) else None
+            if current is not None and current["appid"] == game["appid"]:
+                if current != game:
+                    self._games[row] = dict(game)
+                    if self._thumbnail_source(current) != self._thumbnail_source(game):
+                        self.thumbnails.invalidate(game["appid"])
+                    index = self.index(row, 0)
+                    self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._games.insert(row, dict(game))
+                self.endInsertRows()
+        self._reindex()
+
+    def update_game(self, appid: int, **changes):
+        """Change fields of one game and refresh only its row."""
+        row = self._rows.get(appid)
+        if row is None:
+            return
+        self._games[row].update(changes)
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def remove_games(self, appids: set[int]):
+        """Remove the rows of the given games."""
+        for row in sorted((self._rows[a] for a in appids if a in self._rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._games[row]
+            self.endRemoveRows()
+        self._reindex()
+
+    def add_games(self, games: list[dict]):
+        """Insert games that are not in the model yet at their place in name order."""
+        games = {g["appid"]: g for g in games if g["appid"] not in self._rows}
+        if not games:
+            return
+        for game in games.values():
+            row = bisect.bisect_right(self._games, name_key(game), key=name_key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._games.insert(row, dict(game))
+            self.endInsertRows()
+        self._reindex()
+
+
+class GameFilterProxy(QSortFilterProxyModel):
+    """Hides games not in the current search result set (None = show all)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matches: set[int] | None = None
+
+    def set_matches(self, matches: set[int] | None):
+        self._matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._matches is None:
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        return index.data(GAME_ROLE)["appid"] in self._matches
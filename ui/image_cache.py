@@ -0,0 +1,129 @@
+import os
+import threading
+from collections import OrderedDict
+from PyQt6.QtGui import QImage, QPixmap
+from core.db import APPDATA_DIR
+
+HEADERS_DIR = APPDATA_DIR / "headers"
+
+# Size caps for the header image cache
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+DISK_CACHE_BYTES = 200 * 1024 * 1024
+
+
+class DiskImageCache:
+    """
+    On-disk store of pre-scaled images with a size cap and LRU eviction
+    (file mtime is used as the last-access time). Safe to use from worker threads.
+    """
+
+    def __init__(self, directory, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total = None  # Computed on first write
+
+    def _path(self, key) -> str:
+        return os.path.join(self.directory, f"{key}.jpg")
+
+    def get(self, key) -> QImage | None:
+        path = self._path(key)
+        image = QImage(path) if os.path.exists(path) else QImage()
+        with self._lock:
+            if image.isNull():
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return image
+
+    def put(self, key, image: QImage):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        try:
+            old_size = os.path.getsize(path)  # Overwrites replace, not add to, the total
+        except OSError:
+            old_size = 0
+        if not image.save(path, "JPG", 90):
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = sum(e.stat().st_size for e in os.scandir(self.directory) if e.is_file())
+            else:
+                self._total += os.path.getsize(path) - old_size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until under the cap."""
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.is_file()),
+            key=lambda e: e.stat().st_mtime
+        )
+        for entry in entries:
+            if self._total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._total -= size
+            except OSError:
+                pass
+
+
+class PixmapLRU:
+    """In-memory LRU of decoded pixmaps bounded by pixel bytes. GUI thread only."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict = OrderedDict()
+        self._total = 0
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key) -> QPixmap | None:
+        pixmap = self._items.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return pixmap
+
+    def peek(self, key) -> QPixmap | None:
+        """Lookup without touching counters or recency."""
+        return self._items.get(key)
+
+    def put(self, key, pixmap: QPixmap):
+        if key in self._items:
+            self._total -= self._cost(self._items.pop(key))
+        self._items[key] = pixmap
+        self._total += self._cost(pixmap)
+        while self._total > self.max_bytes and len(self._items) > 1:
+            _, old = self._items.popitem(last=False)
+            self._total -= self._cost(old)
+
+
+# Shared header image caches for the info panel
+header_disk_cache = DiskImageCache(HEADERS_DIR, DISK_CACHE_BYTES)
+header_pixmaps = PixmapLRU(MEMORY_CACHE_BYTES)
+
+
+def header_cache_stats() -> dict:
+    """Hit/miss counters of both header cache tiers."""
+    return {
+        "memory_hits": header_pixmaps.hits,
+        "memory_misses": header_pixmaps.misses,
+        "memory_bytes": header_pixmaps._total,
+        "disk_hits": header_disk_cache.hits,
+        "disk_misses": header_disk_cache.misses,
+    }
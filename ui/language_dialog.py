@@ -1,6 +1,5 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton
 from core.manager import load_settings, save_settings
-from core.i18n import TRANSLATIONS # Import TRANSLATIONS to validate language codes
 from PyQt6.QtGui import QIcon
 from core.manager import resource_path
 
@@ -0,0 +1,44 @@
+from PyQt6.QtCore import QCoreApplication, QObject, pyqtSignal
+from core import i18n
+from core.metrics import get_logger
+
+log = get_logger("I18N")
+
+
+class _LanguageNotifier(QObject):
+    """
+    Relays core.i18n language changes to the GUI thread. The settings store notices
+    external edits on whichever thread reads it first (often a worker), so widgets
+    must not be retranslated from the i18n listener directly.
+    """
+    _changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.moveToThread(QCoreApplication.instance().thread())
+        self._callbacks = []
+        # Queued when emitted from another thread, direct on the GUI thread
+        self._changed.connect(self._dispatch)
+        i18n.on_language_changed(self._changed.emit)
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    def _dispatch(self, lang: str):
+        for callback in list(self._callbacks):
+            try:
+                callback(lang)
+            except Exception as e:
+                log.error("Listener failed: %s", e)
+
+
+_notifier: _LanguageNotifier | None = None
+
+
+def on_language_changed(callback):
+    """Call `callback(lang)` on the GUI thread after every language switch. Returns an unsubscribe function."""
+    global _notifier
+    if _notifier is None:
+        _notifier = _LanguageNotifier()
+    return _notifier.subscribe(callback)
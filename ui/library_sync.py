@@ -0,0 +1,95 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from core.manager import get_setting, quick_refresh
+from core.system import on_battery, running_steam_appid
+from core.metrics import get_logger
+
+log = get_logger("SYNC")
+
+# Seconds between background syncs; doubled after every idle or failed run up to the max
+SYNC_INTERVAL = 15 * 60
+SYNC_MAX_INTERVAL = 4 * 3600
+
+
+class _SyncSignals(QObject):
+    finished = pyqtSignal(object, bool)  # diff (None on failure), failed
+
+
+class _SyncTask(QRunnable):
+    """quick_refresh (manifest scan + Steam playtimes) off the GUI thread."""
+
+    def __init__(self, username: str, signals: _SyncSignals):
+        super().__init__()
+        self.username = username
+        self.signals = signals
+
+    def run(self):
+        try:
+            diff = quick_refresh(self.username)
+        except Exception as e:
+            log.warning("Sync failed: %s", e)
+            self.signals.finished.emit(None, True)
+            return
+        self.signals.finished.emit(diff, False)
+
+
+class LibrarySync(QObject):
+    """
+    Periodic background library sync, meant to run while the window is hidden in the tray.
+    Runs are skipped while a game is running or on battery. When a run finds nothing
+    new (or the network is down) the interval doubles, up to SYNC_MAX_INTERVAL; any
+    change resets it. Emits `changed(diff)` with the quick_refresh diff.
+    The interval is the `sync_interval` setting in seconds (0 disables syncing).
+    """
+    changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._tick)
+
+        self._signals = _SyncSignals()
+        self._signals.finished.connect(self._on_synced)
+        self._running = False
+        self._active = False
+        self._interval = 0
+
+    def _base_interval(self) -> int:
+        return int(get_setting("sync_interval", SYNC_INTERVAL))
+
+    def start(self):
+        """(Re)start syncing at the base interval."""
+        self._interval = self._base_interval()
+        self._active = self._interval > 0
+        self._schedule()
+
+    def stop(self):
+        self._active = False
+        self.timer.stop()
+
+    def _schedule(self):
+        if self._active:
+            self.timer.start(self._interval * 1000)
+
+    def _tick(self):
+        username = get_setting("username")
+        if not username or self._running:
+            self._schedule()
+            return
+        if running_steam_appid() or on_battery():
+            log.debug("Game running or on battery, skipping")
+            self._schedule()
+            return
+
+        self._running = True
+        QThreadPool.globalInstance().start(_SyncTask(username, self._signals))
+
+    def _on_synced(self, diff, failed: bool):
+        self._running = False
+        has_changes = not failed and any(diff[key] for key in diff)
+        if has_changes:
+            self._interval = self._base_interval()
+            self.changed.emit(diff)
+        else:
+            self._interval = min(self._interval * 2, max(SYNC_MAX_INTERVAL, self._base_interval()))
+        self._schedule()
@@ -0,0 +1,91 @@
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QRunnable, QThreadPool, QTimer, pyqtSignal
+from core.db import set_installed
+from core.manager import get_setting
+from core.steam_manifest import SCAN_DEADLINE, get_steamapps_dirs, scan_installed
+from core.metrics import get_logger
+
+log = get_logger("WATCHER")
+
+DEBOUNCE_MS = 500
+
+
+class _ScanSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+class _ScanTask(QRunnable):
+    """Incremental manifest scan + DB update off the GUI thread."""
+
+    def __init__(self, signals: _ScanSignals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = scan_installed(deadline=get_setting("scan_deadline", SCAN_DEADLINE))
+            added, removed = result["added"], result["removed"]
+            set_installed(removed, False)
+            # Only flip stored games; new appids are left to quick_refresh, which
+            # checks ownership and fetches their covers
+            set_installed(added, True)
+        except Exception as e:
+            log.error("Scan failed: %s", e)
+            result = None
+        self.signals.finished.emit(result)
+
+
+class LibraryWatcher(QObject):
+    """
+    Watches every Steam library's steamapps/ and steamapps/common/ folders.
+    Changes are debounced, then an incremental scan runs in the background and
+    `changed(result)` is emitted with the scan result (see scan_installed) when
+    anything was installed or uninstalled. Games not in the DB yet are not added.
+    """
+    changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._schedule)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self._start_scan)
+
+        self._signals = _ScanSignals()
+        self._signals.finished.connect(self._on_scanned)
+        self._scanning = False
+        self._rescan = False
+
+        self._watch_dirs()
+
+    def _watch_dirs(self):
+        """(Re)add library folders; watches are lost when a folder is deleted and recreated."""
+        paths = []
+        for steamapps in get_steamapps_dirs():
+            for folder in (steamapps, steamapps / "common"):
+                if folder.is_dir():
+                    paths.append(str(folder))
+        missing = set(paths) - set(self.watcher.directories())
+        if missing:
+            self.watcher.addPaths(sorted(missing))
+
+    def _schedule(self, path=None):
+        self.timer.start()  # Restart the debounce window
+
+    def _start_scan(self):
+        if self._scanning:
+            self._rescan = True
+            return
+        self._scanning = True
+        QThreadPool.globalInstance().start(_ScanTask(self._signals))
+
+    def _on_scanned(self, result):
+        self._scanning = False
+        self._watch_dirs()
+        if result and (result["added"] or result["removed"]):
+            self.changed.emit(result)
+        if self._rescan:
+            self._rescan = False
+            self._start_scan()
@@ -1,22 +1,26 @@
-from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QListWidget, QLabel, QVBoxLayout, QFrame, QInputDialog, QMessageBox, QListWidgetItem, QPushButton, QSystemTrayIcon, QApplication, QMenu
-from PyQt6.QtGui import QAction, QIcon, QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QListView, QLabel, QVBoxLayout, QFrame, QInputDialog, QMessageBox, QPushButton, QSystemTrayIcon, QApplication, QMenu, QLineEdit
+from PyQt6.QtGui import QAction, QIcon, QPixmap, QImage
+from PyQt6.QtCore import Qt, QTimer, QSize
 from core.i18n import t
+from ui.language_events import on_language_changed
 from core.manager import resource_path, import_games_from_steam, load_settings, quick_refresh, save_settings
-import os, requests
-from core.db import load_games, init_db
+import os
+from core.db import query_games
 from ui.about_dialog import AboutDialog
 from ui.settings_window import SettingsWindow
+from ui.workers import GameInfoLoader, SearchLoader
+from ui.image_cache import header_pixmaps
+from ui.library_watcher import LibraryWatcher
+from ui.library_sync import LibrarySync
+from ui.debug_panel import DebugPanel
+from ui.games_model import GamesModel, GameFilterProxy, GAME_ROLE, ICON_SIZE
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        init_db()
-        
         # Window 
-        self.setWindowTitle(t("app.title"))
         self.setGeometry(200, 200, 1400, 700)
         self.setFixedSize(1500, 800)
 
@@ -32,10 +36,10 @@ class MainWindow(QMainWindow):
         menubar = self.menuBar()
 
         # Import menu
-        import_menu = menubar.addMenu(t("menu.import"))
-        action_local = QAction(t("menu.import_local"), self)
-        action_local.triggered.connect(lambda: print("Hola"))
-        import_menu.addAction(action_local)
+        self.import_menu = menubar.addMenu("")
+        self.action_local = QAction(self)
+        self.action_local.triggered.connect(lambda: print("Hola"))
+        self.import_menu.addAction(self.action_local)
 
         action_steam = QAction("Steam", self)  
         action_steam.setIcon(QIcon(resource_path("assets/icons/steam.ico")))
@@ -43,33 +47,38 @@ class MainWindow(QMainWindow):
         # connect to steam
         action_steam.triggered.connect(self.handle_import_steam)
 
-        import_menu.addAction(action_steam)
+        self.import_menu.addAction(action_steam)
 
 
         # Settings menu
-        settings_menu = menubar.addMenu(t("menu.settings"))
-        settings_action = QAction(t("menu.settings"), self)
-        settings_action.triggered.connect(self.open_settings_window)
-        settings_menu.addAction(settings_action)
+        self.settings_menu = menubar.addMenu("")
+        self.settings_action = QAction(self)
+        self.settings_action.triggered.connect(self.open_settings_window)
+        self.settings_menu.addAction(self.settings_action)
 
         # Help menu
-        help_menu = menubar.addMenu(t("menu.help"))
-        action_about = QAction(t("menu.about"), self)
-        action_about.triggered.connect(lambda: AboutDialog().exec())
-        help_menu.addAction(action_about)
-        report_issue_action = QAction(t("menu.report_issue"), self)
-        report_issue_action.triggered.connect(
+        self.help_menu = menubar.addMenu("")
+        self.action_about = QAction(self)
+        self.action_about.triggered.connect(lambda: AboutDialog().exec())
+        self.help_menu.addAction(self.action_about)
+        self.report_issue_action = QAction(self)
+        self.report_issue_action.triggered.connect(
             lambda: os.startfile("https://github.com/tecomoavocados-dev/issues/issues/new")
         )
         
-        help_menu.addAction(report_issue_action)
+        self.help_menu.addAction(self.report_issue_action)
+
+        self.debug_action = QAction(self)
+        self.debug_action.triggered.connect(self.open_debug_panel)
+        self.help_menu.addAction(self.debug_action)
+        self.debug_panel = None
 
 
         # Icons and Buttons
-        action_local.setIcon(QIcon(resource_path("assets/icons/file.png")))
-        settings_action.setIcon(QIcon(resource_path("assets/icons/settings.png")))
-        action_about.setIcon(QIcon(resource_path("assets/icons/about.png")))
-        report_issue_action.setIcon(QIcon(resource_path("assets/icons/report_problem.png")))
+        self.action_local.setIcon(QIcon(resource_path("assets/icons/file.png")))
+        self.settings_action.setIcon(QIcon(resource_path("assets/icons/settings.png")))
+        self.action_about.setIcon(QIcon(resource_path("assets/icons/about.png")))
+        self.report_issue_action.setIcon(QIcon(resource_path("assets/icons/report_problem.png")))
 
 
         central = QWidget()
@@ -83,14 +92,14 @@ class MainWindow(QMainWindow):
         # Row: "Your Games" + Update button
         title_row = QHBoxLayout()
 
-        title_games = QLabel(t("your.games"))
-        title_games.setObjectName("TitleYourGames")
+        self.title_games = QLabel()
+        self.title_games.setObjectName("TitleYourGames")
 
         self.refresh_btn = QPushButton("Update Library")
         self.refresh_btn.setObjectName("RefreshButton")
         self.refresh_btn.clicked.connect(self.refresh_library)
 
-        title_row.addWidget(title_games)
+        title_row.addWidget(self.title_games)
         title_row.addStretch()
         title_row.addWidget(self.refresh_btn)
 
@@ -101,8 +110,31 @@ class MainWindow(QMainWindow):
         self.games_panel.setObjectName("GamesPanel")
         self.games_panel_layout = QVBoxLayout(self.games_panel)
 
-        self.games_list = QListWidget()
+        # Search box (debounced full-text search)
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("SearchInput")
+        self.search_input.setClearButtonEnabled(True)
+        self.games_panel_layout.addWidget(self.search_input)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_loader = SearchLoader(self)
+        self.search_loader.found.connect(self.show_search_results)
+
+        # Virtualized list: model over the game store + search filter proxy
+        self.games_model = GamesModel(self)
+        self.games_proxy = GameFilterProxy(self)
+        self.games_proxy.setSourceModel(self.games_model)
+
+        self.games_list = QListView()
         self.games_list.setObjectName("GamesList")
+        self.games_list.setModel(self.games_proxy)
+        self.games_list.setUniformItemSizes(True)
+        self.games_list.setIconSize(QSize(ICON_SIZE, ICON_SIZE))
+        self.games_list.verticalScrollBar().valueChanged.connect(self.drop_offscreen_thumbnails)
         self.games_panel_layout.addWidget(self.games_list)
 
         left_layout.addWidget(self.games_panel)
@@ -115,10 +147,10 @@ class MainWindow(QMainWindow):
         right_layout = QVBoxLayout()
 
         # Title
-        title_info = QLabel(t("information.games"))
-        title_info.setObjectName("Title")
-        right_layout.addWidget(title_info)
-        right_layout.addWidget(title_info, 0) 
+        self.title_info = QLabel()
+        self.title_info.setObjectName("Title")
+        right_layout.addWidget(self.title_info)
+        right_layout.addWidget(self.title_info, 0) 
 
         # Information panel
         self.info_panel = QFrame()
@@ -127,8 +159,8 @@ class MainWindow(QMainWindow):
         right_layout.addWidget(self.info_panel, 1)
 
         # Details
-        placeholder = QLabel(t("info.game"))
-        info_layout.addWidget(placeholder)
+        self.info_placeholder = QLabel()
+        info_layout.addWidget(self.info_placeholder)
 
         right_layout.addWidget(self.info_panel)
 
@@ -137,10 +169,57 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(right_layout, 3)
 
 
-        games = load_games()
-        self.populate_games(games)
-        self.games_list.itemClicked.connect(self.show_game_info)
+        # Game details are fetched off the GUI thread
+        self.info_loader = GameInfoLoader(self)
+        self.info_loader.loaded.connect(self.render_game_info)
+        self.current_appid = None
+
+        self.games_list.selectionModel().currentChanged.connect(self.show_game_info)
+        self.library_watcher = None
+
+        # Background sync while hidden in the tray; results land in the model directly
+        self.library_sync = LibrarySync(self)
+        self.library_sync.changed.connect(self.apply_refresh)
+
+        # Reading the library and watching Steam folders waits until the window is up
+        QTimer.singleShot(0, self.load_library)
+
+        # Texts are (re)applied here and on every language switch
+        self.retranslate_ui()
+        unsubscribe_language = on_language_changed(lambda lang: self.retranslate_ui())
+        self.destroyed.connect(lambda: unsubscribe_language())
 
+    def retranslate_ui(self):
+        """Apply the current language to every static text in the window."""
+        self.setWindowTitle(t("app.title"))
+        self.import_menu.setTitle(t("menu.import"))
+        self.action_local.setText(t("menu.import_local"))
+        self.settings_menu.setTitle(t("menu.settings"))
+        self.settings_action.setText(t("menu.settings"))
+        self.help_menu.setTitle(t("menu.help"))
+        self.action_about.setText(t("menu.about"))
+        self.report_issue_action.setText(t("menu.report_issue"))
+        self.debug_action.setText(t("menu.debug"))
+        self.restore_action.setText(t("title.restore"))
+        self.quit_action.setText(t("title.exit"))
+        self.title_games.setText(t("your.games"))
+        self.title_info.setText(t("information.games"))
+        self.search_input.setPlaceholderText(t("search.placeholder"))
+
+        if self.current_appid is None:
+            self.info_placeholder.setText(t("info.game"))
+        else:
+            # Re-render the details panel (served from the local store)
+            self.info_loader.request(self.current_appid, load_image=header_pixmaps.get(self.current_appid) is None)
+
+
+    def load_library(self):
+        """Deferred startup work: fill the list and start watching the Steam libraries."""
+        self.populate_games(query_games(order_by="name"))
+
+        # Install/uninstall changes on disk update the list live
+        self.library_watcher = LibraryWatcher(self)
+        self.library_watcher.changed.connect(self.apply_install_changes)
 
     def handle_import_steam(self):
         """Triggered when user clicks 'Import from Steam'."""
@@ -151,12 +230,10 @@ class MainWindow(QMainWindow):
             return
 
         # Get games from Steam API
-        all_games = import_games_from_steam(username)
-
-        # Keep only installed ones
-        games = all_games
+        games = import_games_from_steam(username)
 
-        self.populate_games(games)
+        # Reload in the list's own order so the model can diff rows instead of resetting
+        self.populate_games(query_games(order_by="name"))
         QMessageBox.information(
         self,
         "Steam",
@@ -165,22 +242,60 @@ class MainWindow(QMainWindow):
 
 
     def populate_games(self, games: list[dict]):
-        """Fill the game panel with imported games."""
-        self.games_list.clear()
-
-        for game in games:
-            item = QListWidgetItem(game['name'])
-
-            cover = game.get("cover")
-            if cover and os.path.exists(cover):
-                pixmap = QPixmap(cover)
-                icon = QIcon(pixmap.scaled(64, 64))
-                item.setIcon(icon)
-            else:
-                print(f"[DEBUG] No local cover for {game['name']}")
+        """Show the given games in the list, updating only the rows that changed."""
+        self.games_model.set_games(games)
+
+        # Keep the current search filter
+        if self.search_input.text().strip():
+            self.apply_search()
+
+    def apply_install_changes(self, result: dict):
+        """Update only the rows affected by a manifest scan."""
+        for appid in result["removed"]:
+            self.games_model.update_game(appid, installed=False)
+
+        for appid in result["added"]:
+            self.games_model.update_game(appid, installed=True)
+
+    def apply_refresh(self, diff: dict):
+        """Apply a quick_refresh diff row by row."""
+        self.games_model.remove_games(diff["removed"])
+        for appid, changes in diff["updated"].items():
+            self.games_model.update_game(appid, **changes)
+        for appid in diff["installed"]:
+            self.games_model.update_game(appid, installed=True)
+        for appid in diff["uninstalled"]:
+            self.games_model.update_game(appid, installed=False)
+        self.games_model.add_games(diff["added"])
+        if (diff["added"] or diff["removed"]) and self.search_input.text().strip():
+            self.apply_search()  # New rows must match the current search
+
+    def drop_offscreen_thumbnails(self):
+        """Cancel queued cover decodes for rows no longer in the viewport."""
+        viewport = self.games_list.viewport().rect()
+        first = self.games_list.indexAt(viewport.topLeft())
+        last = self.games_list.indexAt(viewport.bottomLeft())
+        if not first.isValid():
+            return
+        last_row = last.row() if last.isValid() else self.games_proxy.rowCount() - 1
+
+        visible = {
+            self.games_proxy.index(row, 0).data(GAME_ROLE)["appid"]
+            for row in range(first.row(), last_row + 1)
+        }
+        self.games_model.thumbnails.retain(visible)
+
+    def apply_search(self):
+        """Show only the games matching the search box."""
+        query = self.search_input.text().strip()
+        if query:
+            self.search_loader.request(query)  # Results arrive in show_search_results
+        else:
+            self.games_proxy.set_matches(None)
 
-            item.setData(1000, game)
-            self.games_list.addItem(item)
+    def show_search_results(self, query: str, appids: set):
+        if query == self.search_input.text().strip():
+            self.games_proxy.set_matches(appids)
 
     def refresh_library(self):
         """Update DB + UI without re-downloading existing covers."""
@@ -191,27 +306,50 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Error", "Set your Steam username in settings.")
                 return
 
-            updated_games = quick_refresh(username)
-            self.populate_games(updated_games)
-            QMessageBox.information(self, "Library updated",
-                                    f"Found {len(updated_games)} games (changes applied).")
+            diff = quick_refresh(username)
+            self.apply_refresh(diff)
+            QMessageBox.information(
+                self, "Library updated",
+                f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+                f"{len(diff['updated'])} updated, "
+                f"{len(diff['installed']) + len(diff['uninstalled'])} install changes."
+            )
         except Exception as e:
             QMessageBox.critical(self, "Error while updating", str(e))
 
-    def show_game_info(self, item):
-        """Show selected game details in the right panel."""
-        game = item.data(1000)
+    def show_game_info(self, index, previous=None):
+        """Request details for the selected game; rendered when the worker is done."""
+        if not index.isValid():
+            return
+        game = index.data(GAME_ROLE)
         appid = game["appid"]
+        if appid == self.current_appid:
+            return
 
-        from core.manager import fetch_game_info
-        details = fetch_game_info(appid)
+        self.current_appid = appid
+        self.clear_info_panel()
+        title = QLabel(game.get("name", ""))
+        title.setObjectName("GameTitle")
+        self.info_panel.layout().addWidget(title, alignment=Qt.AlignmentFlag.AlignLeft)
 
+        # Skip the image fetch when the scaled header is already in memory
+        self.info_loader.request(appid, load_image=header_pixmaps.get(appid) is None)
+
+    def clear_info_panel(self):
         layout = self.info_panel.layout()
         for i in reversed(range(layout.count())):
             widget = layout.itemAt(i).widget()
             if widget:
                 widget.deleteLater()
 
+    def render_game_info(self, appid: int, details: dict, image: QImage):
+        """Show game details delivered by the info loader in the right panel."""
+        if appid != self.current_appid:
+            return  # Stale result
+
+        self.clear_info_panel()
+        layout = self.info_panel.layout()
+
         if not details:
             layout.addWidget(QLabel("No se pudo obtener información del juego."))
             return
@@ -221,17 +359,16 @@ class MainWindow(QMainWindow):
         title.setObjectName("GameTitle")
         layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignLeft)
 
-        # ---- Header Image ----
-        if details.get("header_image"):
-            try:
-                pixmap = QPixmap()
-                pixmap.loadFromData(requests.get(details["header_image"]).content)
-                img = QLabel()
-                img.setPixmap(pixmap.scaledToWidth(600, Qt.TransformationMode.SmoothTransformation))
-                img.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                layout.addWidget(img)
-            except Exception as e:
-                print("[DEBUG] No se pudo cargar header_image:", e)
+        # ---- Header Image (already scaled by the worker) ----
+        pixmap = header_pixmaps.peek(appid)
+        if pixmap is None and not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            header_pixmaps.put(appid, pixmap)
+        if pixmap is not None:
+            img = QLabel()
+            img.setPixmap(pixmap)
+            img.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(img)
 
 
         # ---- Description ----
@@ -258,7 +395,7 @@ class MainWindow(QMainWindow):
         genres_data = details.get("genres")
 
         if isinstance(genres_data, list):
-            genres = [g.get("description", "") for g in genres_data if isinstance(g, dict)]
+            genres = [g.get("description", "") if isinstance(g, dict) else str(g) for g in genres_data]
         elif isinstance(genres_data, str):
             genres = [genres_data]
 
@@ -304,6 +441,12 @@ class MainWindow(QMainWindow):
         layout.addWidget(meta_frame)
 
      # Open Settings
+    def open_debug_panel(self):
+        if self.debug_panel is None:
+            self.debug_panel = DebugPanel(self)
+        self.debug_panel.show()
+        self.debug_panel.raise_()
+
     def open_settings_window(self):
         settings_window = SettingsWindow()
         settings_window.exec()
@@ -314,13 +457,13 @@ class MainWindow(QMainWindow):
         tray_menu = QMenu()
         self.tray_icon.setToolTip("Avocado Game Launcher")
 
-        restore_action = QAction(t("title.restore"), self)
-        restore_action.triggered.connect(self.show)  # Open main window
-        tray_menu.addAction(restore_action)
+        self.restore_action = QAction(self)
+        self.restore_action.triggered.connect(self.show)  # Open main window
+        tray_menu.addAction(self.restore_action)
 
-        quit_action = QAction(t("title.exit"), self)
-        quit_action.triggered.connect(QApplication.instance().quit)  # Close app
-        tray_menu.addAction(quit_action)
+        self.quit_action = QAction(self)
+        self.quit_action.triggered.connect(QApplication.instance().quit)  # Close app
+        tray_menu.addAction(self.quit_action)
 
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.activated.connect(self.on_tray_icon_activated)
@@ -335,6 +478,7 @@ class MainWindow(QMainWindow):
             # Minimize to tray
             event.ignore()
             self.hide()
+            self.library_sync.start()
             self.tray_icon.showMessage(
                 "Avocado Game Launcher",
                 t("msg.tray_info"),
@@ -345,6 +489,11 @@ class MainWindow(QMainWindow):
             # Close completely
             event.accept()
 
+    def showEvent(self, event):
+        """Back from the tray: the model is already current, so just stop syncing."""
+        self.library_sync.stop()
+        super().showEvent(event)
+
     def on_tray_icon_activated(self, reason):
         """Restore window on tray double click."""
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
@@ -3,7 +3,7 @@ from PyQt6.QtWidgets import (
     QPushButton, QMessageBox, QFormLayout, QCheckBox
 )
 from core.manager import load_settings, resource_path, save_settings
-from core.i18n import t
+from core.i18n import t, available_languages
 from PyQt6.QtGui import QIcon
 
 
@@ -11,7 +11,7 @@ class SettingsWindow(QDialog):
     def __init__(self):
         super().__init__()
         self.setWindowTitle(t("app.title.settings"))
-        self.setFixedSize(400, 220)
+        self.setFixedSize(400, 250)
         self.setWindowIcon(QIcon(resource_path("assets/icon.ico")))
 
         main_layout = QVBoxLayout(self)
@@ -44,6 +44,11 @@ class SettingsWindow(QDialog):
         self.tray_icon_checkbox.setChecked(self.settings.get("tray_icon", True))
         form_layout.addRow(self.tray_icon_checkbox)
 
+        # Offline mode: serve Steam/RAWG data from the HTTP cache only
+        self.offline_checkbox = QCheckBox(t("settings.offline"))
+        self.offline_checkbox.setChecked(self.settings.get("offline", False))
+        form_layout.addRow(self.offline_checkbox)
+
         main_layout.addLayout(form_layout)
 
         # Save button
@@ -61,7 +66,7 @@ class SettingsWindow(QDialog):
         steam_id = self.steam_input.text().strip()
         language = self.lang_input.text().strip()
 
-        if language not in ("es", "en"):
+        if language not in available_languages():
             QMessageBox.warning(self, "Error", t("err.invalid_language"))
             return
 
@@ -69,6 +74,7 @@ class SettingsWindow(QDialog):
         self.settings["steamid"] = steam_id
         self.settings["language"] = language
         self.settings["tray_icon"] = self.tray_icon_checkbox.isChecked()
+        self.settings["offline"] = self.offline_checkbox.isChecked()
 
         save_settings(self.settings)
         QMessageBox.information(self, t("title.settings"), t("settings.saved"))
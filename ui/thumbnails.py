@@ -0,0 +1,104 @@
+from PyQt6.QtCore import QObject, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QImage, QImageReader, QPixmap, QPixmapCache
+from core.metrics import get_logger, span, count
+
+log = get_logger("THUMBNAILS")
+
+THUMBNAIL_SIZE = 64
+CACHE_LIMIT_KB = 20 * 1024  # ~1300 decoded 64px icons
+
+
+def thumbnail_key(appid: int) -> str:
+    return f"cover:{appid}"
+
+
+class _ThumbnailSignals(QObject):
+    loaded = pyqtSignal(int, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    """Decode one cover straight to thumbnail size off the GUI thread."""
+
+    def __init__(self, appid: int, path: str, signals: _ThumbnailSignals):
+        super().__init__()
+        self.appid = appid
+        self.path = path
+        self.signals = signals
+
+    def run(self):
+        with span("thumbnail.decode"):
+            reader = QImageReader(self.path)
+            reader.setScaledSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            image = reader.read()
+        if image.isNull():
+            log.debug("Could not decode cover for %s: %s", self.appid, reader.errorString())
+        self.signals.loaded.emit(self.appid, image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Background cover thumbnail decoding into QPixmapCache.
+    The most recent requests run first (views ask for the rows they paint), and
+    queued requests for rows that scrolled out of view can be dropped with retain().
+    Emits `loaded(appid)` once a thumbnail is in the cache.
+    """
+    loaded = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), CACHE_LIMIT_KB))
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self._signals = _ThumbnailSignals()
+        self._signals.loaded.connect(self._on_loaded)
+        self._pending: dict[int, _ThumbnailTask] = {}
+        self._failed: set[int] = set()
+        self._priority = 0
+        self._placeholder = None
+
+    def placeholder(self) -> QIcon:
+        if self._placeholder is None:
+            pixmap = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+            pixmap.fill(QColor(60, 60, 60))
+            self._placeholder = QIcon(pixmap)
+        return self._placeholder
+
+    def icon(self, appid: int, path: str | None) -> QIcon | None:
+        """Cached thumbnail icon, or the placeholder while it loads (None if no cover)."""
+        if not path or appid in self._failed:
+            return None
+        pixmap = QPixmapCache.find(thumbnail_key(appid))
+        if pixmap is not None:
+            return QIcon(pixmap)
+        count("thumbnail.cache.miss")
+        self.request(appid, path)
+        return self.placeholder()
+
+    def request(self, appid: int, path: str):
+        if appid in self._pending:
+            return
+        # Newer requests get higher priority: what is on screen now loads first
+        self._priority += 1
+        task = _ThumbnailTask(appid, path, self._signals)
+        task.setAutoDelete(False)
+        self._pending[appid] = task
+        self.pool.start(task, self._priority)
+
+    def retain(self, appids: set[int]):
+        """Cancel queued requests for any appid not in `appids` (e.g. rows scrolled past)."""
+        for appid, task in list(self._pending.items()):
+            if appid not in appids and self.pool.tryTake(task):
+                del self._pending[appid]
+
+    def invalidate(self, appid: int):
+        """Forget a thumbnail (e.g. the cover file changed)."""
+        QPixmapCache.remove(thumbnail_key(appid))
+        self._failed.discard(appid)
+
+    def _on_loaded(self, appid: int, image: QImage):
+        self._pending.pop(appid, None)
+        if image.isNull():
+            self._failed.add(appid)
+        else:
+            QPixmapCache.insert(thumbnail_key(appid), QPixmap.fromImage(image))
+        self.loaded.emit(appid)
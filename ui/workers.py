@@ -0,0 +1,146 @@
+from collections import deque
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+from core.db import search_appids
+from core.manager import fetch_game_info
+from ui.image_cache import header_disk_cache
+from core.metrics import get_logger, span
+
+log = get_logger("INFO")
+
+HEADER_WIDTH = 600
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(int, object, QImage)
+
+
+class _GameInfoTask(QRunnable):
+    """Fetch game details + header image off the GUI thread."""
+
+    def __init__(self, appid: int, signals: _TaskSignals, load_image: bool = True):
+        super().__init__()
+        self.appid = appid
+        self.signals = signals
+        self.load_image = load_image
+
+    def run(self):
+        details = {}
+        image = QImage()
+        try:
+            with span("game_info.details"):
+                details = fetch_game_info(self.appid)
+            url = details.get("header_image")
+            if url and self.load_image:
+                cached = header_disk_cache.get(self.appid)
+                image = cached if cached is not None else self._download_header(url)
+        except Exception as e:
+            log.warning("Game info fetch failed for %s: %s", self.appid, e)
+        self.signals.finished.emit(self.appid, details, image)
+
+    def _download_header(self, url: str) -> QImage:
+        from core import http_client  # Loads requests on first use, not at startup
+
+        image = QImage()
+        resp = http_client.get(url)
+        if resp.status_code != 200:
+            return image
+        with span("header.decode"):
+            if not image.loadFromData(resp.content):
+                return image
+            # Scale here so the GUI thread only converts to a pixmap
+            image = image.scaledToWidth(HEADER_WIDTH, Qt.TransformationMode.SmoothTransformation)
+        header_disk_cache.put(self.appid, image)
+        return image
+
+
+class GameInfoLoader(QObject):
+    """
+    Loads game details in a thread pool and emits `loaded(appid, details, image)`.
+    Only the latest requested appid is emitted; queued requests for older selections
+    are dropped, and repeated requests for the same appid share one fetch.
+    """
+    loaded = pyqtSignal(int, object, QImage)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(4)
+        self._signals = _TaskSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._pending: dict[int, _GameInfoTask] = {}
+        self._latest: int | None = None
+
+    def request(self, appid: int, load_image: bool = True):
+        self._latest = appid
+
+        # Cancel queued (not yet running) work for previous selections
+        for other, task in list(self._pending.items()):
+            if other != appid and self.pool.tryTake(task):
+                del self._pending[other]
+
+        if appid in self._pending:
+            return  # Already in flight, share it
+
+        task = _GameInfoTask(appid, self._signals, load_image)
+        task.setAutoDelete(False)
+        self._pending[appid] = task
+        self.pool.start(task)
+
+    def _on_finished(self, appid: int, details: dict, image: QImage):
+        self._pending.pop(appid, None)
+        if appid == self._latest:
+            self.loaded.emit(appid, details, image)
+
+
+class _SearchSignals(QObject):
+    finished = pyqtSignal(str, object)
+
+
+class _SearchTask(QRunnable):
+    """Full-text search off the GUI thread (the typo fallback can build its index)."""
+
+    def __init__(self, query: str, signals: _SearchSignals):
+        super().__init__()
+        self.query = query
+        self.signals = signals
+
+    def run(self):
+        try:
+            appids = search_appids(self.query)
+        except Exception as e:
+            log.warning("Search failed for '%s': %s", self.query, e)
+            appids = set()
+        self.signals.finished.emit(self.query, appids)
+
+
+class SearchLoader(QObject):
+    """
+    Runs searches one at a time and emits `found(query, appids)` for the latest query only.
+    A query typed while another search runs replaces any queued one.
+    """
+    found = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _SearchSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._tasks: deque[_SearchTask] = deque()  # Started and not finished, oldest first
+        self._latest: str | None = None
+
+    def request(self, query: str):
+        self._latest = query
+        # At most one search waits behind the running one: drop the previous query
+        if len(self._tasks) > 1 and self.pool.tryTake(self._tasks[-1]):
+            self._tasks.pop()
+        task = _SearchTask(query, self._signals)
+        task.setAutoDelete(False)
+        self._tasks.append(task)
+        self.pool.start(task)
+
+    def _on_finished(self, query: str, appids: set):
+        self._tasks.popleft()  # Single thread: tasks finish in start order
+        if query == self._latest:
+            self.found.emit(query, appids)